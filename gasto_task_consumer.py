@@ -7,32 +7,87 @@ through callbacks.
 """
 
 import pika
+import functools
+import importlib
 import json
-import dataclasses
 import logging
+import math
+import queue
+import threading
 import time
 import comtypes
 from datetime import datetime
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Set
 
 from config import RABBITMQ_HOST, RABBITMQ_PORT, RABBITMQ_USER, RABBITMQ_PASS
-from sical_base import OperationEncoder, OperationResult, OperationStatus
+from sical_base import (
+    OperationEncoder, OperationResult, OperationStatus, SicalOperationProcessor,
+    operation_json_default
+)
 from sical_logging import setup_logging, get_consumer_logger
-from sical_config import GUI_EVENTS
+from sical_config import (
+    GUI_EVENTS, RABBITMQ_PREFETCH, RABBITMQ_ACK_BATCH_SIZE, RABBITMQ_ACK_FLUSH_INTERVAL
+)
 
-# Import processors
-from processors import ADO220Processor, PMP450Processor
 
-# Import legacy ordenarypagar (to be refactored later)
-from processors.ordenar_tasks import ordenar_y_pagar_operacion_gasto as legacy_ordenar_pagar
+# orjson is optional: it parses/serializes messages several times faster,
+# but the consumer falls back to the stdlib encoder when it is missing
+try:
+    import orjson
 
+    _json_loads = orjson.loads
 
-# Registry of available operation processors
-OPERATION_PROCESSORS: Dict[str, type] = {
-    'ado220': ADO220Processor,
-    'pmp450': PMP450Processor,
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=operation_json_default)
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, cls=OperationEncoder).encode('utf-8')
+
+
+# Registry of available operation processors ('module:ClassName').
+# Processor modules are imported on first use of their operation type.
+OPERATION_PROCESSORS: Dict[str, str] = {
+    'ado220': 'processors.ado220_processor:ADO220Processor',
+    'pmp450': 'processors.pmp450_processor:PMP450Processor',
 }
 
+# GUI event names, resolved once at import
+EVT_CONNECTED = GUI_EVENTS['connected']
+EVT_DISCONNECTED = GUI_EVENTS['disconnected']
+EVT_TASK_RECEIVED = GUI_EVENTS['task_received']
+EVT_TASK_STARTED = GUI_EVENTS['task_started']
+EVT_TASK_COMPLETED = GUI_EVENTS['task_completed']
+EVT_TASK_FAILED = GUI_EVENTS['task_failed']
+
+# Result statuses reported to the GUI as a completed task
+SUCCESS_STATUSES = (OperationStatus.COMPLETED, OperationStatus.IN_PROGRESS)
+
+
+def _sum_importes(aplicaciones: list) -> float:
+    """Sum the 'importe' of every aplicacion; missing or null amounts count as 0."""
+    importes = [app.get('importe') or 0 for app in aplicaciones]
+    try:
+        # JSON numbers are already int/float, so no per-item float() is needed
+        return math.fsum(importes)
+    except TypeError:
+        # Some producers send amounts as strings
+        return math.fsum(map(float, importes))
+
+
+class _Delivery:
+    """The parts of a RabbitMQ delivery the worker and reply stages need."""
+
+    __slots__ = ('tag', 'body', 'correlation_id', 'reply_to')
+
+    def __init__(self, tag: int, body: bytes, correlation_id: Optional[str], reply_to: Optional[str]):
+        self.tag = tag
+        self.body = body
+        self.correlation_id = correlation_id
+        self.reply_to = reply_to
+
 
 class GastoConsumer:
     """
@@ -46,33 +101,89 @@ class GastoConsumer:
     - Sends responses back via RabbitMQ
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        prefetch_count: Optional[int] = None
+    ):
         """
         Initialize the consumer.
 
         Args:
             logger: Optional logger instance (creates one if not provided)
+            prefetch_count: Optional QoS prefetch override (defaults to RABBITMQ_PREFETCH)
         """
-        self.connection: Optional[pika.BlockingConnection] = None
+        self.connection: Optional[pika.SelectConnection] = None
         self.channel: Optional[pika.channel.Channel] = None
         self.queue_name = 'sical_queue.gasto'
+        self.prefetch_count = prefetch_count if prefetch_count is not None else RABBITMQ_PREFETCH
         self.logger = logger or get_consumer_logger()
 
         # GUI callbacks
         self.status_callback: Optional[Callable] = None
         self.task_callback: Optional[Callable] = None
 
+        # One processor instance per operation type, created on first use
+        self._processor_cache: Dict[str, SicalOperationProcessor] = {}
+
+        # Operation type -> handler, resolved with a single lookup per message.
+        # Processor handlers are added by _load_processor.
+        self._dispatch: Dict[str, Callable[[Dict[str, Any]], OperationResult]] = {
+            'ordenarypagar': self._run_legacy_ordenar_pagar,
+        }
+
+        # Message format extractor that matched last (tried first next time)
+        self._preferred_extractor: Callable[[Dict[str, Any]], Optional[tuple]] = self._extract_wrapped
+
         # Connection state
         self.is_connected = False
+        self._closing = False
+        self._consumer_tag: Optional[str] = None
+        self._connection_error: Optional[Exception] = None
+
+        # Completed deliveries waiting for a batched ack. Pending acks count
+        # against prefetch, so a batch can hold at most prefetch - 1 of them
+        # (prefetch 0 is unlimited); with the default prefetch of 2 every ack
+        # is sent immediately instead of waiting for the flush interval
+        if self.prefetch_count:
+            self._ack_batch_size = max(1, min(RABBITMQ_ACK_BATCH_SIZE, self.prefetch_count - 1))
+        else:
+            self._ack_batch_size = RABBITMQ_ACK_BATCH_SIZE
+        self._pending_ack_tag: Optional[int] = None
+        self._pending_ack_count = 0
+        self._ack_timer = None
+
+        # Reused for every reply; only touched from the IO loop. Replies are
+        # persistent: once confirmed, the source message is acked and the
+        # result exists nowhere else
+        self._reply_properties = pika.BasicProperties(delivery_mode=pika.DeliveryMode.Persistent)
+
+        # Reply publish sequence number -> source delivery tag, awaiting broker confirm
+        self._publish_seq = 0
+        self._unconfirmed: Dict[int, int] = {}
+
+        # Delivery tags handed to the worker and not yet acked/nacked
+        self._in_flight: Set[int] = set()
+
+        # Single worker thread that owns the COM apartment used by the processors.
+        # The IO loop keeps running (heartbeats, prefetch, acks) while it works.
+        # The queue never holds more than the prefetch window.
+        self._work_queue: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
 
         # Setup connection
         self.setup_connection()
 
     def setup_connection(self) -> None:
-        """Establish connection to RabbitMQ."""
+        """
+        Create the RabbitMQ connection.
+
+        The connection is asynchronous: it is opened once the IO loop runs in
+        start_consuming(), which then chains channel, queue and QoS setup.
+        """
         try:
             credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
-            self.connection = pika.BlockingConnection(
+            self.connection = pika.SelectConnection(
                 pika.ConnectionParameters(
                     host=RABBITMQ_HOST,
                     port=RABBITMQ_PORT,
@@ -80,33 +191,95 @@ class GastoConsumer:
                     heartbeat=600,
                     retry_delay=2.0,
                     socket_timeout=5.0
-                )
-            )
-            self.channel = self.connection.channel()
-
-            # Declare the queue
-            self.channel.queue_declare(
-                queue=self.queue_name,
-                durable=True
+                ),
+                on_open_callback=self._on_connection_open,
+                on_open_error_callback=self._on_connection_open_error,
+                on_close_callback=self._on_connection_closed
             )
 
-            # Set QoS to handle one message at a time
-            self.channel.basic_qos(prefetch_count=1)
-
-            self.logger.info('RabbitMQ connection established successfully')
-            self.is_connected = True
-
-            # Notify callback of connection
-            if self.status_callback:
-                self.status_callback(GUI_EVENTS['connected'])
-
         except Exception as e:
-            self.logger.error(f'Failed to connect to RabbitMQ: {e}')
+            self.logger.error('Failed to connect to RabbitMQ: %s', e)
             self.is_connected = False
             if self.status_callback:
-                self.status_callback(GUI_EVENTS['disconnected'])
+                self.status_callback(EVT_DISCONNECTED)
             raise
 
+    def _on_connection_open(self, connection: pika.SelectConnection) -> None:
+        """Open the channel once the connection is ready."""
+        self.logger.debug('RabbitMQ connection opened')
+        connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_connection_open_error(self, connection: pika.SelectConnection, error: Exception) -> None:
+        """Record the connection failure and stop the IO loop."""
+        self.logger.error('Failed to connect to RabbitMQ: %s', error)
+        self._connection_error = error
+        self._set_disconnected()
+        connection.ioloop.stop()
+
+    def _on_connection_closed(self, connection: pika.SelectConnection, reason: Exception) -> None:
+        """Stop the IO loop when the connection closes."""
+        self.channel = None
+        if not self._closing:
+            self.logger.error('RabbitMQ connection closed unexpectedly: %s', reason)
+            self._connection_error = reason
+        self._set_disconnected()
+        connection.ioloop.stop()
+
+    def _on_channel_open(self, channel: pika.channel.Channel) -> None:
+        """Declare the queue once the channel is open."""
+        self.channel = channel
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.add_on_return_callback(self._on_reply_returned)
+
+        # Publisher confirms: a request is only acked once its reply is confirmed
+        channel.confirm_delivery(ack_nack_callback=self._on_delivery_confirmation)
+
+        channel.queue_declare(
+            queue=self.queue_name,
+            durable=True,
+            callback=self._on_queue_declared
+        )
+
+    def _on_channel_closed(self, channel: pika.channel.Channel, reason: Exception) -> None:
+        """Close the connection when the channel goes away."""
+        self.channel = None
+        self._unconfirmed.clear()
+        if not self._closing:
+            self.logger.warning('RabbitMQ channel closed: %s', reason)
+        if self.connection.is_open:
+            self.connection.close()
+
+    def _on_queue_declared(self, frame) -> None:
+        """Apply QoS once the queue exists."""
+        # Keep a small pipeline of deliveries ready; messages are still
+        # processed one at a time by the worker thread
+        self.channel.basic_qos(
+            prefetch_count=self.prefetch_count,
+            callback=self._on_qos_ok
+        )
+
+    def _on_qos_ok(self, frame) -> None:
+        """Start consuming once QoS is set."""
+        self._consumer_tag = self.channel.basic_consume(
+            queue=self.queue_name,
+            on_message_callback=self.callback
+        )
+
+        self.logger.info('RabbitMQ connection established successfully')
+        self.is_connected = True
+
+        # Notify callback of connection
+        if self.status_callback:
+            self.status_callback(EVT_CONNECTED)
+
+        self.logger.info('Starting to consume messages from %s', self.queue_name)
+
+    def _set_disconnected(self) -> None:
+        """Update connection state and notify the GUI."""
+        self.is_connected = False
+        if self.status_callback:
+            self.status_callback(EVT_DISCONNECTED)
+
     def set_status_callback(self, callback: Callable) -> None:
         """
         Set the status callback function for GUI updates.
@@ -115,10 +288,11 @@ class GastoConsumer:
             callback: Function to call for status updates
         """
         self.status_callback = callback
+        self._update_processor_callbacks()
 
         # Emit current connection state
         if callback and self.is_connected:
-            callback(GUI_EVENTS['connected'])
+            callback(EVT_CONNECTED)
 
     def set_task_callback(self, callback: Callable) -> None:
         """
@@ -128,12 +302,20 @@ class GastoConsumer:
             callback: Function to call for task progress
         """
         self.task_callback = callback
+        self._update_processor_callbacks()
+
+    def _update_processor_callbacks(self) -> None:
+        """Propagate the GUI callbacks to the cached processors."""
+        for processor in self._processor_cache.values():
+            processor.set_callbacks(self.status_callback, self.task_callback)
 
     def callback(self, ch, method, properties, body) -> None:
         """
-        Process incoming messages from RabbitMQ.
+        Receive a message from RabbitMQ and hand it to the worker thread.
 
-        This is called automatically by pika for each message received.
+        This is called by pika on the IO loop for each message received, so it
+        returns immediately; the reply and ack are scheduled back onto the loop
+        once the worker has processed the message.
 
         Args:
             ch: Channel
@@ -141,15 +323,65 @@ class GastoConsumer:
             properties: Message properties
             body: Message body
         """
-        self.logger.info(f'Received message with correlation_id: {properties.correlation_id}')
+        if self._closing:
+            # Left unacked; the broker requeues it when the channel closes
+            return
+
+        self.logger.debug('Received message with correlation_id: %s', properties.correlation_id)
+
+        # Keep only the fields needed downstream, not pika's method/properties
+        self._in_flight.add(method.delivery_tag)
+        self._work_queue.put(
+            _Delivery(method.delivery_tag, body, properties.correlation_id, properties.reply_to)
+        )
+
+    def _worker_loop(self) -> None:
+        """
+        Process queued messages one at a time (runs in the worker thread).
 
+        COM is initialized once for the lifetime of the thread. The reply and
+        ack are scheduled back onto the IO loop, the only thread allowed to
+        use the channel.
+        """
+        self._initialize_worker_com()
         try:
-            # Parse incoming message
-            data = json.loads(body)
-            self.logger.debug(f'Message content: {data}')
+            while True:
+                delivery = self._work_queue.get()
+                if delivery is None:
+                    break
+
+                response_body = self._process_message(delivery)
+                self.connection.ioloop.add_callback_threadsafe(
+                    functools.partial(self._finish_message, delivery, response_body)
+                )
+        finally:
+            # Uninitialize COM for this thread
+            try:
+                comtypes.CoUninitialize()
+                self.logger.info('COM uninitialized for worker thread')
+            except Exception as e:
+                self.logger.warning('Error uninitializing COM: %s', e)
+
+    def _process_message(self, delivery: _Delivery) -> Optional[bytes]:
+        """
+        Process a message in the worker thread.
+
+        Args:
+            delivery: Message received from RabbitMQ
+
+        Returns:
+            Serialized response to publish, or None if the message must be requeued
+        """
+        cb = self.status_callback
+
+        try:
+            # Parse incoming message (orjson reads the raw bytes directly)
+            data = _json_loads(delivery.body)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug('Message content: %s', data)
 
             # Extract operation details
-            task_id = data.get('task_id', properties.correlation_id)
+            task_id = data.get('task_id', delivery.correlation_id)
             operation_type, operation_data = self._extract_operation_data(data)
 
             # BUGFIX: Merge duplicate policy fields from top-level message if present
@@ -157,81 +389,237 @@ class GastoConsumer:
             for policy_field in ('duplicate_policy', 'duplicate_confirmation_token', 'duplicate_check_id'):
                 if policy_field in data and policy_field not in operation_data:
                     operation_data[policy_field] = data[policy_field]
-                    self.logger.info(f'Merged {policy_field} from message root: {data[policy_field]}')
+                    self.logger.debug('Merged %s from message root: %s', policy_field, data[policy_field])
 
             # Notify GUI of task received
-            if self.status_callback:
-                self.status_callback(GUI_EVENTS['task_received'], task_id=task_id)
+            if cb:
+                cb(EVT_TASK_RECEIVED, task_id=task_id)
 
-            # Build task details for GUI
-            task_details = self._build_task_details(task_id, operation_type, operation_data)
-            started_at = task_details['started_at']
+            # Build task details for GUI (one clock read for duration and started_at)
             start_time = time.time()
+            task_details = self._build_task_details(task_id, operation_type, operation_data, start_time)
 
             # Notify GUI of task started
-            if self.status_callback:
-                self.status_callback(GUI_EVENTS['task_started'], **task_details)
+            if cb:
+                cb(EVT_TASK_STARTED, **task_details)
 
             # Add tipo to operation_data for compatibility
             operation_data['tipo'] = operation_type
 
-            self.logger.info(f'Processing {operation_type} operation')
+            self.logger.debug('Processing %s operation', operation_type)
 
             # Route to appropriate processor
             result = self._process_operation(operation_type, operation_data)
 
-            self.logger.info(f'Operation completed: {operation_type} - '
-                           f'Status: {result.status.value}, '
-                           f'Error: {result.error if result.error else "None"}')
+        except Exception as e:
+            self.logger.exception('Error processing message: %s', e)
 
-            # Prepare and send response
-            response = {
-                'status': result.status.value,
-                'operation_id': task_id,
-                'result': dataclasses.asdict(result)
-            }
+            # Notify GUI of failure
+            if cb:
+                if 'task_details' in locals() and 'start_time' in locals():
+                    # task_details is local to this message; update it in place
+                    task_details['duration_seconds'] = time.time() - start_time
+                    task_details['error_message'] = str(e)
+                    cb(EVT_TASK_FAILED, **task_details)
+                else:
+                    cb(
+                        EVT_TASK_FAILED,
+                        task_id=delivery.correlation_id,
+                        error_message=str(e)
+                    )
 
-            ch.basic_publish(
-                exchange='',
-                routing_key=properties.reply_to,
-                properties=pika.BasicProperties(
-                    correlation_id=properties.correlation_id
-                ),
-                body=json.dumps(response, cls=OperationEncoder)
-            )
+            return None
 
-            # Acknowledge message
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            self.logger.info(f'Successfully processed message {properties.correlation_id}')
+        # The operation has run in SICAL from here on, so nothing below may
+        # lead to a requeue: failures still produce a reply and an ack
 
-            # Notify GUI of completion
+        # The one INFO record per message; fields are also passed as extras
+        # so handlers can use them without parsing the message
+        self.logger.info(
+            'Operation completed: %s - Status: %s, Error: %s (correlation_id: %s)',
+            operation_type, result.status.value, result.error or 'None', delivery.correlation_id,
+            extra={
+                'correlation_id': delivery.correlation_id,
+                'operation_type': operation_type,
+                'operation_status': result.status.value,
+            }
+        )
+
+        response_body = self._serialize_response(task_id, result)
+
+        # Notify GUI of completion
+        try:
             self._notify_task_completion(task_details, result, start_time)
+        except Exception as e:
+            self.logger.exception('Error notifying GUI of completed task %s: %s', task_id, e)
+
+        return response_body
 
+    def _serialize_response(self, task_id: str, result: OperationResult) -> bytes:
+        """
+        Serialize the reply for an operation that has already run.
+
+        orjson rejects some values the stdlib encoder accepts (non-str keys,
+        ints wider than 64 bits), so it falls back to json with
+        OperationEncoder, and finally to a failure reply carrying the error.
+        """
+        # The result dataclass is serialized directly, without the deep copy
+        # made by dataclasses.asdict
+        response = {
+            'status': result.status.value,
+            'operation_id': task_id,
+            'result': result
+        }
+        try:
+            return _json_dumps(response)
         except Exception as e:
-            self.logger.exception(f'Error processing message: {e}')
+            self.logger.warning('Fast serialization failed for task %s, using json: %s', task_id, e)
 
-            # Notify GUI of failure
-            if self.status_callback:
-                if 'task_details' in locals() and 'start_time' in locals():
-                    failure_details = task_details.copy()
-                    failure_details['duration_seconds'] = time.time() - start_time
-                    failure_details['error_message'] = str(e)
-                    self.status_callback(GUI_EVENTS['task_failed'], **failure_details)
-                else:
-                    self.status_callback(
-                        GUI_EVENTS['task_failed'],
-                        task_id=properties.correlation_id,
-                        error_message=str(e)
-                    )
+        try:
+            return json.dumps(response, cls=OperationEncoder).encode('utf-8')
+        except Exception as e:
+            self.logger.exception('Could not serialize result for task %s: %s', task_id, e)
+            return json.dumps({
+                'status': OperationStatus.FAILED.value,
+                'operation_id': task_id,
+                'error': f'Result could not be serialized: {e}'
+            }, default=str).encode('utf-8')
+
+    def _finish_message(self, delivery: _Delivery, response_body: Optional[bytes]) -> None:
+        """
+        Publish the reply and acknowledge the message on the IO loop.
+
+        Args:
+            delivery: Message received from RabbitMQ
+            response_body: Serialized response, or None to requeue the message
+        """
+        self._in_flight.discard(delivery.tag)
 
+        if self.channel is None or not self.channel.is_open:
+            self.logger.warning(
+                'Channel closed before message %s could be acknowledged; it will be redelivered',
+                delivery.correlation_id
+            )
+        elif response_body is None:
+            # Settle earlier successes first so the nack cannot be folded into them
+            self._flush_acks()
             # Negative acknowledgment - message will be requeued
-            ch.basic_nack(delivery_tag=method.delivery_tag)
+            self.channel.basic_nack(delivery_tag=delivery.tag)
+        else:
+            try:
+                # Safe to reuse: pika encodes the properties into the frame immediately
+                self._reply_properties.correlation_id = delivery.correlation_id
+                self.channel.basic_publish(
+                    exchange='',
+                    routing_key=delivery.reply_to,
+                    properties=self._reply_properties,
+                    body=response_body,
+                    mandatory=True
+                )
+
+                # The source message is acked when the broker confirms the reply
+                self._publish_seq += 1
+                self._unconfirmed[self._publish_seq] = delivery.tag
+                self.logger.debug('Successfully processed message %s', delivery.correlation_id)
+            except Exception as e:
+                self.logger.exception('Error sending reply for message %s: %s', delivery.correlation_id, e)
+                # Settle it now so a later batched ack cannot cover it; it is not
+                # requeued because the operation has already run in SICAL
+                self._flush_acks()
+                self.channel.basic_nack(delivery_tag=delivery.tag, requeue=False)
+
+        self._maybe_finish_shutdown()
+
+    def _on_reply_returned(self, channel, method, properties, body) -> None:
+        """
+        Log a reply the broker could not route to its reply_to queue.
+
+        The broker still confirms a returned message, so its request is acked
+        as usual; requeueing it would repeat an operation already applied in
+        SICAL.
+        """
+        self.logger.error(
+            'Reply for message %s was returned by the broker (%s %s): reply_to queue %s is missing',
+            properties.correlation_id, method.reply_code, method.reply_text, method.routing_key
+        )
+
+    def _on_delivery_confirmation(self, frame) -> None:
+        """
+        Acknowledge source messages once the broker confirms their replies.
+
+        Until the broker has taken responsibility for a reply, its request
+        stays unacked, so a connection drop leads to redelivery instead of a
+        silently lost reply. A rejected reply is logged and its request acked
+        anyway, since the operation has already been applied in SICAL.
+        """
+        method = frame.method
+        confirmed = method.delivery_tag
+        is_ack = isinstance(method, pika.spec.Basic.Ack)
+
+        if method.multiple:
+            sequences = [seq for seq in self._unconfirmed if seq <= confirmed]
+        else:
+            sequences = [confirmed] if confirmed in self._unconfirmed else []
+
+        for seq in sequences:
+            source_tag = self._unconfirmed.pop(seq)
+            if not is_ack:
+                self.logger.error(
+                    'Broker rejected the reply for delivery %s; '
+                    'acknowledging it anyway to avoid re-running the operation',
+                    source_tag
+                )
+
+            # A batched multiple=True ack must not cover older requests whose
+            # replies are still unconfirmed; ack out-of-order ones individually
+            oldest_unconfirmed = next(iter(self._unconfirmed.values()), None)
+            if oldest_unconfirmed is None or source_tag < oldest_unconfirmed:
+                self._queue_ack(source_tag)
+            elif self.channel and self.channel.is_open:
+                self.channel.basic_ack(delivery_tag=source_tag)
+
+        self._maybe_finish_shutdown()
+
+    def _maybe_finish_shutdown(self) -> None:
+        """Close the channel once a pending shutdown has nothing left to settle."""
+        if self._closing and not self._in_flight and not self._unconfirmed:
+            self._close_channel()
+
+    def _queue_ack(self, delivery_tag: int) -> None:
+        """
+        Queue a delivery for a batched ``basic_ack(multiple=True)``.
+
+        Messages are processed in delivery order by a single worker, so acking
+        the latest tag with multiple=True only covers deliveries already settled.
+        """
+        self._pending_ack_tag = delivery_tag
+        self._pending_ack_count += 1
+
+        if self._pending_ack_count >= self._ack_batch_size:
+            self._flush_acks()
+        elif self._ack_timer is None:
+            self._ack_timer = self.connection.ioloop.call_later(
+                RABBITMQ_ACK_FLUSH_INTERVAL, self._flush_acks
+            )
+
+    def _flush_acks(self) -> None:
+        """Acknowledge all queued deliveries with a single frame."""
+        timer, self._ack_timer = self._ack_timer, None
+        if timer is not None:
+            self.connection.ioloop.remove_timeout(timer)
+
+        if self._pending_ack_tag is not None and self.channel and self.channel.is_open:
+            self.channel.basic_ack(delivery_tag=self._pending_ack_tag, multiple=True)
+
+        self._pending_ack_tag = None
+        self._pending_ack_count = 0
 
     def _extract_operation_data(self, data: Dict[str, Any]) -> tuple:
         """
         Extract operation type and data from message.
 
-        Supports both wrapped and direct message formats.
+        Supports both wrapped and direct message formats. The format that
+        matched last is tried first, since producers rarely mix formats.
 
         Args:
             data: Raw message data
@@ -242,38 +630,55 @@ class GastoConsumer:
         Raises:
             ValueError: If message format is invalid
         """
-        if 'operation_data' in data and 'operation' in data.get('operation_data', {}):
-            # Wrapped format from producer
-            self.logger.debug('Processing wrapped message format')
-            operation_wrapper = data.get('operation_data', {}).get('operation', {})
-            operation_type = operation_wrapper.get('tipo', 'unknown')
-            operation_data = operation_wrapper.get('detalle', {})
+        extracted = self._preferred_extractor(data)
+        if extracted is not None:
+            return extracted
+
+        for extractor in (self._extract_wrapped, self._extract_direct):
+            if extractor != self._preferred_extractor:
+                extracted = extractor(data)
+                if extracted is not None:
+                    self._preferred_extractor = extractor
+                    return extracted
+
+        raise ValueError(
+            'Invalid message format - must contain either '
+            '"operation_data.operation" or "tipo" and "detalle" fields'
+        )
 
-            # BUGFIX: Merge duplicate policy fields from wrapper level if present
-            # Some producers may send these at operation_data level instead of detalle
-            wrapper_data = data.get('operation_data', {})
-            for policy_field in ('duplicate_policy', 'duplicate_confirmation_token', 'duplicate_check_id'):
-                if policy_field in wrapper_data and policy_field not in operation_data:
-                    operation_data[policy_field] = wrapper_data[policy_field]
-                    self.logger.debug(f'Merged {policy_field} from wrapper level: {wrapper_data[policy_field]}')
-        elif 'tipo' in data and 'detalle' in data:
-            # Direct v2 format
-            self.logger.debug('Processing direct v2 message format')
-            operation_type = data.get('tipo')
-            operation_data = data.get('detalle', {})
-        else:
-            raise ValueError(
-                'Invalid message format - must contain either '
-                '"operation_data.operation" or "tipo" and "detalle" fields'
-            )
+    def _extract_wrapped(self, data: Dict[str, Any]) -> Optional[tuple]:
+        """Extract from the wrapped producer format, or return None if not wrapped."""
+        wrapper_data = data.get('operation_data')
+        if not isinstance(wrapper_data, dict) or (operation_wrapper := wrapper_data.get('operation')) is None:
+            return None
+
+        self.logger.debug('Processing wrapped message format')
+        operation_type = operation_wrapper.get('tipo', 'unknown')
+        operation_data = operation_wrapper.get('detalle') or {}
+
+        # BUGFIX: Merge duplicate policy fields from wrapper level if present
+        # Some producers may send these at operation_data level instead of detalle
+        for policy_field in ('duplicate_policy', 'duplicate_confirmation_token', 'duplicate_check_id'):
+            if policy_field in wrapper_data and policy_field not in operation_data:
+                operation_data[policy_field] = wrapper_data[policy_field]
+                self.logger.debug('Merged %s from wrapper level: %s', policy_field, wrapper_data[policy_field])
 
         return operation_type, operation_data
 
+    def _extract_direct(self, data: Dict[str, Any]) -> Optional[tuple]:
+        """Extract from the direct v2 format, or return None if not direct."""
+        if 'tipo' not in data or 'detalle' not in data:
+            return None
+
+        self.logger.debug('Processing direct v2 message format')
+        return data['tipo'], data['detalle'] or {}
+
     def _build_task_details(
         self,
         task_id: str,
         operation_type: str,
-        operation_data: Dict[str, Any]
+        operation_data: Dict[str, Any],
+        start_time: float
     ) -> Dict[str, Any]:
         """
         Build task details dictionary for GUI callbacks.
@@ -282,35 +687,36 @@ class GastoConsumer:
             task_id: Task identifier
             operation_type: Type of operation
             operation_data: Operation data
+            start_time: Unix timestamp when task started
 
         Returns:
             Dictionary with task details
         """
+        get = operation_data.get
+
         # Calculate total amount from aplicaciones
-        aplicaciones = operation_data.get('aplicaciones', [])
-        total_amount = sum(
-            float(app.get('importe', 0)) for app in aplicaciones
-        ) if aplicaciones else None
+        aplicaciones = get('aplicaciones', [])
+        total_amount = _sum_importes(aplicaciones) if aplicaciones else None
 
         # Build description from texto_sical
-        texto_sical_list = operation_data.get('texto_sical', [])
+        texto_sical_list = get('texto_sical', [])
         description = texto_sical_list[0].get('texto_ado', '') if texto_sical_list else None
 
         return {
             'task_id': task_id,
             'operation_type': operation_type,
-            'operation_number': operation_data.get('num_operacion'),
+            'operation_number': get('num_operacion'),
             'amount': total_amount,
-            'date': operation_data.get('fecha'),
-            'cash_register': operation_data.get('caja'),
-            'third_party': operation_data.get('tercero'),
-            'nature': operation_data.get('naturaleza'),
+            'date': get('fecha'),
+            'cash_register': get('caja'),
+            'third_party': get('tercero'),
+            'nature': get('naturaleza'),
             'description': description,
             'total_line_items': len(aplicaciones),
-            'started_at': datetime.now().isoformat(),
+            'started_at': datetime.fromtimestamp(start_time).isoformat(),
             # Policy and token information
-            'duplicate_policy': operation_data.get('duplicate_policy'),
-            'duplicate_confirmation_token': operation_data.get('duplicate_confirmation_token')
+            'duplicate_policy': get('duplicate_policy'),
+            'duplicate_confirmation_token': get('duplicate_confirmation_token')
         }
 
     def _process_operation(
@@ -328,31 +734,48 @@ class GastoConsumer:
         Returns:
             OperationResult from processor
         """
-        if operation_type in OPERATION_PROCESSORS:
-            # Use new processor system
-            processor_class = OPERATION_PROCESSORS[operation_type]
-            processor = processor_class(self.logger)
+        handler = self._dispatch.get(operation_type)
+        if handler is None and operation_type in OPERATION_PROCESSORS:
+            handler = self._load_processor(operation_type).execute
+        if handler is not None:
+            return handler(operation_data)
+
+        # Unknown operation type
+        self.logger.warning('Unknown operation type: %s', operation_type)
+        return OperationResult(
+            status=OperationStatus.PENDING,
+            init_time=datetime.now().isoformat(),
+            sical_is_open=False,
+            error=f'Unknown operation type: {operation_type}'
+        )
 
-            # Set callbacks for GUI communication
-            processor.set_callbacks(self.status_callback, self.task_callback)
+    def _load_processor(self, operation_type: str) -> SicalOperationProcessor:
+        """
+        Import, instantiate and cache the processor for an operation type.
 
-            # Execute operation
-            return processor.execute(operation_data)
+        Args:
+            operation_type: Key in OPERATION_PROCESSORS
 
-        elif operation_type == 'ordenarypagar':
-            # Use legacy ordenarypagar (to be refactored)
-            self.logger.info('Using legacy ordenarypagar handler')
-            return legacy_ordenar_pagar(operation_data)
+        Returns:
+            The cached processor instance
+        """
+        module_name, _, class_name = OPERATION_PROCESSORS[operation_type].partition(':')
+        processor_class = getattr(importlib.import_module(module_name), class_name)
 
-        else:
-            # Unknown operation type
-            self.logger.warning(f'Unknown operation type: {operation_type}')
-            return OperationResult(
-                status=OperationStatus.PENDING,
-                init_time=datetime.now().isoformat(),
-                sical_is_open=False,
-                error=f'Unknown operation type: {operation_type}'
-            )
+        processor = processor_class(self.logger)
+        processor.set_callbacks(self.status_callback, self.task_callback)
+
+        self._processor_cache[operation_type] = processor
+        self._dispatch[operation_type] = processor.execute
+        return processor
+
+    def _run_legacy_ordenar_pagar(self, operation_data: Dict[str, Any]) -> OperationResult:
+        """Run the legacy ordenarypagar handler (to be refactored)."""
+        # Imported on first use (to be refactored later)
+        from processors.ordenar_tasks import ordenar_y_pagar_operacion_gasto as legacy_ordenar_pagar
+
+        self.logger.info('Using legacy ordenarypagar handler')
+        return legacy_ordenar_pagar(operation_data)
 
     def _notify_task_completion(
         self,
@@ -364,92 +787,130 @@ class GastoConsumer:
         Notify GUI of task completion.
 
         Args:
-            task_details: Original task details
+            task_details: Task details for this message (updated in place)
             result: Operation result
             start_time: Unix timestamp when task started
         """
-        if not self.status_callback:
+        cb = self.status_callback
+        if not cb:
             return
 
-        # Calculate duration
-        duration_seconds = time.time() - start_time
-
-        # Build completion details
-        completion_details = task_details.copy()
-        completion_details['duration_seconds'] = duration_seconds
-        completion_details['error_message'] = result.error if result.error else None
+        # Add completion details
+        task_details['duration_seconds'] = time.time() - start_time
+        task_details['error_message'] = result.error if result.error else None
 
         # Update operation number if assigned
         if result.num_operacion:
-            completion_details['operation_number'] = result.num_operacion
+            task_details['operation_number'] = result.num_operacion
 
         # Determine success/failure
-        success_statuses = (
-            OperationStatus.COMPLETED,
-            OperationStatus.IN_PROGRESS
-        )
-
-        if result.status in success_statuses:
-            self.status_callback(GUI_EVENTS['task_completed'], **completion_details)
+        if result.status in SUCCESS_STATUSES:
+            cb(EVT_TASK_COMPLETED, **task_details)
         else:
-            self.status_callback(GUI_EVENTS['task_failed'], **completion_details)
+            cb(EVT_TASK_FAILED, **task_details)
 
-    def start_consuming(self) -> None:
-        """Start consuming messages from the queue."""
+    def _initialize_worker_com(self) -> None:
+        """
+        Initialize COM for the worker thread.
+
+        This ensures COM stays initialized across all task executions
+        and avoids COM state issues between successive tasks. The UI
+        Automation objects used by robocorp.windows live in this
+        single-threaded apartment, so they are reused across messages
+        without re-marshalling.
+        """
         try:
-            # Initialize COM for this thread
-            # This ensures COM stays initialized across all task executions
-            # and avoids COM state issues between successive tasks
-            try:
-                comtypes.CoInitialize()
-                self.logger.info('COM initialized for consumer thread')
-            except Exception as e:
-                self.logger.warning(f'COM initialization warning (may already be initialized): {e}')
+            comtypes.CoInitializeEx(comtypes.COINIT_APARTMENTTHREADED)
+            self.logger.info('COM initialized (STA) for worker thread')
+        except Exception as e:
+            self.logger.warning('COM initialization warning (may already be initialized): %s', e)
 
-            self.logger.info(f'Starting to consume messages from {self.queue_name}')
+    def start_consuming(self) -> None:
+        """
+        Run the IO loop until stop_consuming is called.
 
-            # Register callback
-            self.channel.basic_consume(
-                queue=self.queue_name,
-                on_message_callback=self.callback
-            )
+        Raises:
+            pika.exceptions.AMQPConnectionError: If the connection failed or was lost
+        """
+        self._worker = threading.Thread(
+            target=self._worker_loop,
+            daemon=True,
+            name='SicalWorker'
+        )
+        self._worker.start()
 
-            # Start consuming (blocks until stop_consuming is called)
-            self.channel.start_consuming()
+        try:
+            # Blocks until the connection is closed
+            self.connection.ioloop.start()
 
         except KeyboardInterrupt:
             self.logger.info('Received interrupt signal, shutting down...')
-            self.stop_consuming()
-        except Exception as e:
-            self.logger.error(f'Error while consuming messages: {e}')
-            self.stop_consuming()
-            raise
+            self._shutdown()
+            # Let the close handshake complete
+            self.connection.ioloop.start()
         finally:
-            # Uninitialize COM for this thread
-            try:
-                comtypes.CoUninitialize()
-                self.logger.info('COM uninitialized for consumer thread')
-            except Exception as e:
-                self.logger.warning(f'Error uninitializing COM: {e}')
+            # Let the worker exit once it finishes its current message
+            self._drain_work_queue()
+            self._work_queue.put(None)
+
+        if self._connection_error is not None:
+            self.logger.error('Error while consuming messages: %s', self._connection_error)
+            raise pika.exceptions.AMQPConnectionError(self._connection_error)
 
     def stop_consuming(self) -> None:
-        """Stop consuming messages and close connections."""
+        """
+        Stop consuming messages and close connections.
+
+        Safe to call from any thread: the shutdown runs on the IO loop. The
+        message being processed is allowed to finish and be acknowledged;
+        prefetched messages not yet started are requeued.
+        """
+        if self.connection is None or self.connection.is_closed or self._closing:
+            return
+
         try:
-            if self.channel:
-                self.channel.stop_consuming()
-            if self.connection and not self.connection.is_closed:
-                self.connection.close()
-            self.logger.info('Successfully shut down consumer')
+            self.connection.ioloop.add_callback_threadsafe(self._shutdown)
+        except Exception as e:
+            self.logger.error('Error while shutting down: %s', e)
 
-            # Update connection state
-            self.is_connected = False
+    def _shutdown(self) -> None:
+        """Cancel the consumer and close the channel (runs on the IO loop)."""
+        if self._closing:
+            return
+        self._closing = True
 
-            # Notify GUI
-            if self.status_callback:
-                self.status_callback(GUI_EVENTS['disconnected'])
+        # Drop prefetched messages the worker has not started yet; they stay
+        # unacked and the broker requeues them when the channel closes
+        self._drain_work_queue()
 
-        except Exception as e:
-            self.logger.error(f'Error while shutting down: {e}')
+        if self.channel and self.channel.is_open and self._consumer_tag:
+            self.channel.basic_cancel(self._consumer_tag, callback=self._on_cancel_ok)
+        elif self.connection.is_open:
+            self.connection.close()
+        else:
+            self.connection.ioloop.stop()
+
+    def _drain_work_queue(self) -> None:
+        """Remove messages the worker has not started from the work queue."""
+        while True:
+            try:
+                item = self._work_queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self._in_flight.discard(item.tag)
+
+    def _on_cancel_ok(self, frame) -> None:
+        """Close the channel once the broker confirms the consumer cancellation."""
+        self.logger.info('Consumer cancelled, waiting for in-flight messages')
+        self._maybe_finish_shutdown()
+
+    def _close_channel(self) -> None:
+        """Close the channel; the connection follows in _on_channel_closed."""
+        if self.channel and self.channel.is_open:
+            self._flush_acks()
+            self.channel.close()
+            self.logger.info('Successfully shut down consumer')
 
 
 # Main entry point for standalone execution
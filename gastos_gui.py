@@ -9,6 +9,8 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import threading
 import logging
+from functools import partial
+from difflib import SequenceMatcher
 from datetime import datetime
 from typing import Optional
 
@@ -16,6 +18,19 @@ from status_manager import status_manager
 from task_history_db import get_task_history_db
 
 
+# Text tag used to colour a log line, by log level
+LOG_LEVEL_TAGS = {
+    "DEBUG": "DEBUG",
+    "INFO": "INFO",
+    "WARNING": "WARNING",
+    "ERROR": "ERROR",
+    "CRITICAL": "ERROR",
+}
+
+# History rows fetched per page; the next page loads when scrolling near the end
+HISTORY_PAGE_SIZE = 100
+
+
 class LogHandler(logging.Handler):
     """Custom logging handler that sends logs to the status manager."""
 
@@ -42,9 +57,28 @@ class GastosGUI:
         self.consumer_thread: Optional[threading.Thread] = None
         self.consumer = None
 
+        # Lines currently shown in the complete logs tab, and the pending
+        # filter debounce, so filter refreshes only touch what changed
+        self._rendered_logs: list = []
+        self._log_filter_after_id = None
+
+        # History paging: filters of the current listing, rows loaded so far,
+        # and whether the last page has been reached
+        self._history_query: tuple = (None, None)
+        self._history_cursor = 0
+        self._history_exhausted = True
+        self._history_page_after_id = None
+
+        # Last status_manager log and state versions drawn by update_display
+        self._displayed_log_version = None
+        self._displayed_state_version = None
+
         # Setup logging to capture logs
         self.setup_logging()
 
+        # Shared label styles
+        self.setup_styles()
+
         # Create UI
         self.create_widgets()
 
@@ -66,6 +100,15 @@ class GastosGUI:
         gui_handler.setFormatter(formatter)
         root_logger.addHandler(gui_handler)
 
+    def setup_styles(self):
+        """Define the named label styles used across the panels."""
+        style = ttk.Style(self.root)
+        style.configure("Title.TLabel", font=("Segoe UI", 14, "bold"))
+        style.configure("Stat.TLabel", font=("Segoe UI", 11, "bold"))
+        style.configure("Value.TLabel", font=("Segoe UI", 10, "bold"))
+        style.configure("Field.TLabel", font=("Segoe UI", 9))
+        style.configure("FieldBold.TLabel", font=("Segoe UI", 9, "bold"))
+
     def create_widgets(self):
         """Create all GUI widgets."""
         # Main container with padding
@@ -82,7 +125,7 @@ class GastosGUI:
         title_label = ttk.Label(
             main_frame,
             text="SICAL Gastos Robot - Status Monitor",
-            font=("Segoe UI", 14, "bold")
+            style="Title.TLabel"
         )
         title_label.grid(row=0, column=0, pady=(0, 10))
 
@@ -182,48 +225,48 @@ class GastosGUI:
         stats_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
 
         # Total tasks
-        ttk.Label(stats_frame, text="Total Tasks:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Total Tasks:", style="Field.TLabel").grid(
             row=0, column=0, sticky=tk.W, padx=(0, 20)
         )
         self.hist_total_label = ttk.Label(
             stats_frame,
             text="0",
-            font=("Segoe UI", 10, "bold")
+            style="Value.TLabel"
         )
         self.hist_total_label.grid(row=0, column=1, sticky=tk.W)
 
         # Completed
-        ttk.Label(stats_frame, text="Completed:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Completed:", style="Field.TLabel").grid(
             row=0, column=2, sticky=tk.W, padx=(20, 5)
         )
         self.hist_completed_label = ttk.Label(
             stats_frame,
             text="0",
-            font=("Segoe UI", 10, "bold"),
+            style="Value.TLabel",
             foreground="green"
         )
         self.hist_completed_label.grid(row=0, column=3, sticky=tk.W, padx=(0, 20))
 
         # Failed
-        ttk.Label(stats_frame, text="Failed:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Failed:", style="Field.TLabel").grid(
             row=0, column=4, sticky=tk.W, padx=(0, 5)
         )
         self.hist_failed_label = ttk.Label(
             stats_frame,
             text="0",
-            font=("Segoe UI", 10, "bold"),
+            style="Value.TLabel",
             foreground="red"
         )
         self.hist_failed_label.grid(row=0, column=5, sticky=tk.W, padx=(0, 20))
 
         # Average duration
-        ttk.Label(stats_frame, text="Avg Duration:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Avg Duration:", style="Field.TLabel").grid(
             row=0, column=6, sticky=tk.W, padx=(0, 5)
         )
         self.hist_avg_duration_label = ttk.Label(
             stats_frame,
             text="--",
-            font=("Segoe UI", 10, "bold")
+            style="Value.TLabel"
         )
         self.hist_avg_duration_label.grid(row=0, column=7, sticky=tk.W)
 
@@ -233,7 +276,7 @@ class GastosGUI:
         table_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
 
         # Create Treeview with scrollbars
-        tree_scroll_y = ttk.Scrollbar(table_frame, orient=tk.VERTICAL)
+        self.history_scroll_y = ttk.Scrollbar(table_frame, orient=tk.VERTICAL)
         tree_scroll_x = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL)
 
         self.history_tree = ttk.Treeview(
@@ -241,12 +284,12 @@ class GastosGUI:
             columns=("task_id", "type", "operation", "date", "amount", "cash_register",
                     "third_party", "nature", "status", "duration", "completed_at"),
             show="headings",
-            yscrollcommand=tree_scroll_y.set,
+            yscrollcommand=self.on_history_yscroll,
             xscrollcommand=tree_scroll_x.set,
             height=15
         )
 
-        tree_scroll_y.config(command=self.history_tree.yview)
+        self.history_scroll_y.config(command=self.history_tree.yview)
         tree_scroll_x.config(command=self.history_tree.xview)
 
         # Define columns
@@ -277,7 +320,7 @@ class GastosGUI:
 
         # Grid layout
         self.history_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        tree_scroll_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.history_scroll_y.grid(row=0, column=1, sticky=(tk.N, tk.S))
         tree_scroll_x.grid(row=1, column=0, sticky=(tk.W, tk.E))
 
         # Configure grid weights
@@ -303,7 +346,7 @@ class GastosGUI:
         excel_btn = ttk.Button(
             export_frame,
             text="📊 Excel (.xlsx)",
-            command=lambda: self.export_history("excel"),
+            command=partial(self.export_history, "excel"),
             width=15
         )
         excel_btn.grid(row=0, column=1, padx=5)
@@ -312,7 +355,7 @@ class GastosGUI:
         json_btn = ttk.Button(
             export_frame,
             text="📄 JSON",
-            command=lambda: self.export_history("json"),
+            command=partial(self.export_history, "json"),
             width=15
         )
         json_btn.grid(row=0, column=2, padx=5)
@@ -321,7 +364,7 @@ class GastosGUI:
         csv_btn = ttk.Button(
             export_frame,
             text="📋 CSV",
-            command=lambda: self.export_history("csv"),
+            command=partial(self.export_history, "csv"),
             width=15
         )
         csv_btn.grid(row=0, column=3, padx=5)
@@ -360,13 +403,13 @@ class GastosGUI:
         )
         self.log_level_filter.set("All")
         self.log_level_filter.grid(row=0, column=1, sticky=tk.W, padx=(0, 15))
-        self.log_level_filter.bind("<<ComboboxSelected>>", lambda e: self.apply_log_filters())
+        self.log_level_filter.bind("<<ComboboxSelected>>", self.on_log_filter_changed)
 
         # Search entry
         ttk.Label(filter_frame, text="Search:").grid(row=0, column=2, sticky=tk.W, padx=(0, 5))
         self.log_search_entry = ttk.Entry(filter_frame, width=40)
         self.log_search_entry.grid(row=0, column=3, sticky=(tk.W, tk.E), padx=(0, 10))
-        self.log_search_entry.bind("<KeyRelease>", lambda e: self.apply_log_filters())
+        self.log_search_entry.bind("<KeyRelease>", self.on_log_filter_changed)
 
         # Apply button
         apply_btn = ttk.Button(
@@ -450,13 +493,13 @@ class GastosGUI:
         clear_logs_btn.grid(row=0, column=2, padx=5)
 
         # Export logs button
-        export_logs_btn = ttk.Button(
+        self.export_logs_btn = ttk.Button(
             control_frame,
             text="💾 Export Logs",
             command=self.export_logs,
             width=15
         )
-        export_logs_btn.grid(row=0, column=3, padx=5)
+        self.export_logs_btn.grid(row=0, column=3, padx=5)
 
         # Refresh button
         refresh_logs_btn = ttk.Button(
@@ -476,44 +519,32 @@ class GastosGUI:
 
         # Get all logs from status manager
         status = status_manager.get_status()
-        all_logs = status['recent_logs']
+        all_logs = status['recent_logs_typed']
 
         # Filter logs
         filtered_logs = []
-        for log in all_logs:
+        for log, level, message in all_logs:
             # Level filter
-            if level_filter != "All":
-                if f"[{level_filter}]" not in log:
-                    continue
+            if level_filter != "All" and level != level_filter:
+                continue
 
             # Search filter
             if search_term and search_term not in log.lower():
                 continue
 
-            # Remove timestamps if needed
-            if not show_timestamps and log.startswith("["):
-                # Extract just the message part
-                parts = log.split("]", 2)
-                if len(parts) >= 3:
-                    log = parts[2].strip()
+            # Show just the message part if timestamps are hidden
+            if not show_timestamps:
+                log = message.strip()
 
-            filtered_logs.append(log)
-
-        # Update display
-        self.complete_log_text.config(state=tk.NORMAL)
-        self.complete_log_text.delete("1.0", tk.END)
+            filtered_logs.append((log, LOG_LEVEL_TAGS.get(level, "INFO")))
 
-        for log in filtered_logs:
-            # Determine tag based on log level
-            tag = "INFO"
-            if "[ERROR]" in log or "[CRITICAL]" in log:
-                tag = "ERROR"
-            elif "[WARNING]" in log:
-                tag = "WARNING"
-            elif "[DEBUG]" in log:
-                tag = "DEBUG"
+        # Update display, touching only the lines that changed
+        if filtered_logs == self._rendered_logs:
+            return
 
-            self.complete_log_text.insert(tk.END, log + "\n", tag)
+        self.complete_log_text.config(state=tk.NORMAL)
+        self._sync_log_lines(self.complete_log_text, self._rendered_logs, filtered_logs)
+        self._rendered_logs = filtered_logs
 
         # Auto-scroll if enabled
         if self.auto_scroll_var.get():
@@ -521,6 +552,60 @@ class GastosGUI:
 
         self.complete_log_text.config(state=tk.DISABLED)
 
+    def on_log_filter_changed(self, event=None):
+        """Handle a change in the log filter widgets."""
+        self.schedule_log_filters()
+
+    def schedule_log_filters(self, delay_ms: int = 150):
+        """Apply log filters once filter input pauses, coalescing event bursts."""
+        if self._log_filter_after_id is not None:
+            self.root.after_cancel(self._log_filter_after_id)
+        self._log_filter_after_id = self.root.after(delay_ms, self._run_scheduled_log_filters)
+
+    def _run_scheduled_log_filters(self):
+        """Run the debounced log filter refresh."""
+        self._log_filter_after_id = None
+        self.apply_log_filters()
+
+    @staticmethod
+    def _sync_log_lines(text_widget, old_logs: list, new_logs: list):
+        """
+        Update a text widget showing old_logs so it shows new_logs.
+
+        Both lists hold (line, tag) pairs. Only the line ranges that differ
+        are deleted or inserted. Opcodes are applied from the bottom up so
+        earlier line numbers stay valid.
+        """
+        opcodes = SequenceMatcher(a=old_logs, b=new_logs, autojunk=False).get_opcodes()
+        for op, i1, i2, j1, j2 in reversed(opcodes):
+            if op == 'equal':
+                continue
+            if i2 > i1:
+                text_widget.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+            if j2 > j1:
+                text_widget.insert(f"{i1 + 1}.0", *GastosGUI._tagged_runs(new_logs[j1:j2]))
+
+    @staticmethod
+    def _tagged_runs(lines: list) -> list:
+        """
+        Flatten (line, tag) pairs into Text.insert arguments.
+
+        Consecutive lines with the same tag are joined into one chunk, so a
+        run of same-level logs is inserted as a single tagged string.
+        """
+        chunks = []
+        run = []
+        run_tag = None
+        for log, tag in lines:
+            if tag != run_tag and run:
+                chunks.extend(("".join(run), run_tag))
+                run = []
+            run_tag = tag
+            run.append(log + "\n")
+        if run:
+            chunks.extend(("".join(run), run_tag))
+        return chunks
+
     def clear_log_filters(self):
         """Clear all log filters."""
         self.log_level_filter.set("All")
@@ -533,6 +618,7 @@ class GastosGUI:
             self.complete_log_text.config(state=tk.NORMAL)
             self.complete_log_text.delete("1.0", tk.END)
             self.complete_log_text.config(state=tk.DISABLED)
+            self._rendered_logs = []
             status_manager.add_log("Logs cleared from display", "INFO")
 
     def refresh_complete_logs(self):
@@ -552,23 +638,45 @@ class GastosGUI:
             if not filepath:
                 return  # User cancelled
 
-            # Get all logs
-            status = status_manager.get_status()
-            all_logs = status['recent_logs']
+            # Snapshot the logs here; the file is written off the Tk thread
+            all_logs = status_manager.get_status()['recent_logs']
+
+            self.export_logs_btn.config(state=tk.DISABLED)
+            threading.Thread(
+                target=self._write_logs_file,
+                args=(filepath, all_logs),
+                daemon=True
+            ).start()
 
-            # Write to file
-            with open(filepath, 'w', encoding='utf-8') as f:
+        except Exception as e:
+            status_manager.add_log(f"Failed to export logs: {e}", "ERROR")
+            messagebox.showerror("Error", f"Failed to export logs:\n{e}")
+
+    def _write_logs_file(self, filepath: str, all_logs: list):
+        """Write exported logs to disk (runs in a background thread)."""
+        error = None
+        try:
+            with open(filepath, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
                 f.write("SICAL Gastos Robot - Complete Logs\n")
                 f.write("=" * 80 + "\n\n")
                 for log in all_logs:
                     f.write(log + "\n")
+        except Exception as e:
+            error = e
 
+        # Report back on the Tk thread
+        self.root.after(0, self._on_logs_exported, filepath, error)
+
+    def _on_logs_exported(self, filepath: str, error: Optional[Exception]):
+        """Show the result of a log export."""
+        self.export_logs_btn.config(state=tk.NORMAL)
+
+        if error is None:
             messagebox.showinfo("Success", f"Logs exported successfully to:\n{filepath}")
             status_manager.add_log(f"Logs exported to {filepath}", "INFO")
-
-        except Exception as e:
-            status_manager.add_log(f"Failed to export logs: {e}", "ERROR")
-            messagebox.showerror("Error", f"Failed to export logs:\n{e}")
+        else:
+            status_manager.add_log(f"Failed to export logs: {error}", "ERROR")
+            messagebox.showerror("Error", f"Failed to export logs:\n{error}")
 
     def create_status_panel(self, parent):
         """Create the service status panel."""
@@ -581,7 +689,7 @@ class GastosGUI:
             status_frame,
             text="● STOPPED",
             foreground="red",
-            font=("Segoe UI", 10, "bold")
+            style="Value.TLabel"
         )
         self.service_status_label.grid(row=0, column=1, sticky=tk.W, padx=(5, 20))
 
@@ -591,7 +699,7 @@ class GastosGUI:
             status_frame,
             text="● DISCONNECTED",
             foreground="red",
-            font=("Segoe UI", 10, "bold")
+            style="Value.TLabel"
         )
         self.rabbitmq_status_label.grid(row=0, column=3, sticky=tk.W, padx=5)
 
@@ -610,61 +718,61 @@ class GastosGUI:
             stats_frame.columnconfigure(i, weight=1)
 
         # Pending
-        ttk.Label(stats_frame, text="Pending:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Pending:", style="Field.TLabel").grid(
             row=0, column=0, sticky=tk.W
         )
         self.pending_label = ttk.Label(
             stats_frame,
             text="0",
-            font=("Segoe UI", 11, "bold"),
+            style="Stat.TLabel",
             foreground="orange"
         )
         self.pending_label.grid(row=1, column=0, sticky=tk.W)
 
         # Processing
-        ttk.Label(stats_frame, text="Processing:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Processing:", style="Field.TLabel").grid(
             row=0, column=1, sticky=tk.W
         )
         self.processing_label = ttk.Label(
             stats_frame,
             text="0",
-            font=("Segoe UI", 11, "bold"),
+            style="Stat.TLabel",
             foreground="blue"
         )
         self.processing_label.grid(row=1, column=1, sticky=tk.W)
 
         # Completed
-        ttk.Label(stats_frame, text="Completed:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Completed:", style="Field.TLabel").grid(
             row=0, column=2, sticky=tk.W
         )
         self.completed_label = ttk.Label(
             stats_frame,
             text="0",
-            font=("Segoe UI", 11, "bold"),
+            style="Stat.TLabel",
             foreground="green"
         )
         self.completed_label.grid(row=1, column=2, sticky=tk.W)
 
         # Failed
-        ttk.Label(stats_frame, text="Failed:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Failed:", style="Field.TLabel").grid(
             row=0, column=3, sticky=tk.W
         )
         self.failed_label = ttk.Label(
             stats_frame,
             text="0",
-            font=("Segoe UI", 11, "bold"),
+            style="Stat.TLabel",
             foreground="red"
         )
         self.failed_label.grid(row=1, column=3, sticky=tk.W)
 
         # Success Rate
-        ttk.Label(stats_frame, text="Success Rate:", font=("Segoe UI", 9)).grid(
+        ttk.Label(stats_frame, text="Success Rate:", style="Field.TLabel").grid(
             row=0, column=4, sticky=tk.W
         )
         self.success_rate_label = ttk.Label(
             stats_frame,
             text="0.0%",
-            font=("Segoe UI", 11, "bold")
+            style="Stat.TLabel"
         )
         self.success_rate_label.grid(row=1, column=4, sticky=tk.W)
 
@@ -681,66 +789,66 @@ class GastosGUI:
         self.current_task_label = ttk.Label(
             task_frame,
             text="No task currently processing",
-            font=("Segoe UI", 9, "bold"),
+            style="FieldBold.TLabel",
             foreground="gray"
         )
         self.current_task_label.grid(row=0, column=0, sticky=tk.W, columnspan=4, pady=(0, 5))
 
         # Row 1: Operation Type and Operation Number
-        ttk.Label(task_frame, text="Type:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Type:", style="Field.TLabel").grid(
             row=1, column=0, sticky=tk.W
         )
         self.operation_type_label = ttk.Label(task_frame, text="--")
         self.operation_type_label.grid(row=1, column=1, sticky=tk.W, padx=(5, 15))
 
-        ttk.Label(task_frame, text="Operation:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Operation:", style="Field.TLabel").grid(
             row=1, column=2, sticky=tk.W
         )
         self.operation_label = ttk.Label(task_frame, text="--")
         self.operation_label.grid(row=1, column=3, sticky=tk.W, padx=5)
 
         # Row 2: Date and Duration
-        ttk.Label(task_frame, text="Date:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Date:", style="Field.TLabel").grid(
             row=2, column=0, sticky=tk.W
         )
         self.date_label = ttk.Label(task_frame, text="--")
         self.date_label.grid(row=2, column=1, sticky=tk.W, padx=(5, 15))
 
-        ttk.Label(task_frame, text="Duration:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Duration:", style="Field.TLabel").grid(
             row=2, column=2, sticky=tk.W
         )
         self.duration_label = ttk.Label(task_frame, text="--")
         self.duration_label.grid(row=2, column=3, sticky=tk.W, padx=5)
 
         # Row 3: Amount and Cash Register
-        ttk.Label(task_frame, text="Amount:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Amount:", style="Field.TLabel").grid(
             row=3, column=0, sticky=tk.W
         )
         self.amount_label = ttk.Label(task_frame, text="--")
         self.amount_label.grid(row=3, column=1, sticky=tk.W, padx=(5, 15))
 
-        ttk.Label(task_frame, text="Cash Register:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Cash Register:", style="Field.TLabel").grid(
             row=3, column=2, sticky=tk.W
         )
         self.cash_register_label = ttk.Label(task_frame, text="--")
         self.cash_register_label.grid(row=3, column=3, sticky=tk.W, padx=5)
 
         # Row 4: Nature (full width)
-        ttk.Label(task_frame, text="Nature:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Nature:", style="Field.TLabel").grid(
             row=4, column=0, sticky=tk.W
         )
         self.nature_label = ttk.Label(task_frame, text="--")
         self.nature_label.grid(row=4, column=1, sticky=tk.W, columnspan=3, padx=5)
 
         # Row 5: Third Party (full width)
-        ttk.Label(task_frame, text="Third Party:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Third Party:", style="Field.TLabel").grid(
             row=5, column=0, sticky=tk.W
         )
         self.third_party_label = ttk.Label(task_frame, text="--", wraplength=600)
         self.third_party_label.grid(row=5, column=1, sticky=tk.W, columnspan=3, padx=5)
 
         # Row 6: Description (full width)
-        ttk.Label(task_frame, text="Description:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Description:", style="Field.TLabel").grid(
             row=6, column=0, sticky=tk.W
         )
         self.description_label = ttk.Label(task_frame, text="--", wraplength=600)
@@ -752,21 +860,21 @@ class GastosGUI:
         )
 
         # Row 8: Line items progress
-        ttk.Label(task_frame, text="Line Items:", font=("Segoe UI", 9, "bold")).grid(
+        ttk.Label(task_frame, text="Line Items:", style="FieldBold.TLabel").grid(
             row=8, column=0, sticky=tk.W
         )
-        self.line_items_label = ttk.Label(task_frame, text="--", font=("Segoe UI", 9))
+        self.line_items_label = ttk.Label(task_frame, text="--", style="Field.TLabel")
         self.line_items_label.grid(row=8, column=1, sticky=tk.W, columnspan=3, padx=5)
 
         # Row 9: Current line item details
-        ttk.Label(task_frame, text="Current Item:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Current Item:", style="Field.TLabel").grid(
             row=9, column=0, sticky=tk.W
         )
         self.line_item_details_label = ttk.Label(task_frame, text="--", wraplength=600)
         self.line_item_details_label.grid(row=9, column=1, sticky=tk.W, columnspan=3, padx=5)
 
         # Row 10: Current step
-        ttk.Label(task_frame, text="Status:", font=("Segoe UI", 9)).grid(
+        ttk.Label(task_frame, text="Status:", style="Field.TLabel").grid(
             row=10, column=0, sticky=tk.W
         )
         self.step_label = ttk.Label(task_frame, text="--", wraplength=600, foreground="blue")
@@ -778,17 +886,17 @@ class GastosGUI:
         )
 
         # Row 12: Duplicate Policy (bold label)
-        ttk.Label(task_frame, text="Duplicate Policy:", font=("Segoe UI", 9, "bold")).grid(
+        ttk.Label(task_frame, text="Duplicate Policy:", style="FieldBold.TLabel").grid(
             row=12, column=0, sticky=tk.W
         )
-        self.policy_label = ttk.Label(task_frame, text="--", font=("Segoe UI", 9))
+        self.policy_label = ttk.Label(task_frame, text="--", style="Field.TLabel")
         self.policy_label.grid(row=12, column=1, sticky=tk.W, columnspan=3, padx=5)
 
         # Row 13: Confirmation Token
-        ttk.Label(task_frame, text="Token:", font=("Segoe UI", 9, "bold")).grid(
+        ttk.Label(task_frame, text="Token:", style="FieldBold.TLabel").grid(
             row=13, column=0, sticky=tk.W
         )
-        self.token_label = ttk.Label(task_frame, text="--", font=("Segoe UI", 9), wraplength=600)
+        self.token_label = ttk.Label(task_frame, text="--", style="Field.TLabel", wraplength=600)
         self.token_label.grid(row=13, column=1, sticky=tk.W, columnspan=3, padx=5)
 
     def create_control_panel(self, parent):
@@ -1002,18 +1110,6 @@ class GastosGUI:
         # Get current status
         status = status_manager.get_status()
 
-        # Update service status
-        if status['service_running']:
-            self.service_status_label.config(text="● RUNNING", foreground="green")
-        else:
-            self.service_status_label.config(text="● STOPPED", foreground="red")
-
-        # Update RabbitMQ status
-        if status['rabbitmq_connected']:
-            self.rabbitmq_status_label.config(text="● CONNECTED", foreground="green")
-        else:
-            self.rabbitmq_status_label.config(text="● DISCONNECTED", foreground="red")
-
         # Update uptime
         if status['uptime']:
             hours = int(status['uptime'] // 3600)
@@ -1023,228 +1119,240 @@ class GastosGUI:
         else:
             self.uptime_label.config(text="--:--:--")
 
-        # Update statistics
-        stats = status['stats']
-        self.pending_label.config(text=str(stats['pending']))
-        self.processing_label.config(text=str(stats['processing']))
-        self.completed_label.config(text=str(stats['completed']))
-        self.failed_label.config(text=str(stats['failed']))
-        self.success_rate_label.config(text=f"{status['success_rate']:.1f}%")
-
-        # Update current task
+        # Duration of the running task also advances on every tick
         current_task = status['current_task']
         if current_task:
-            task_id = current_task['task_id'][:16] + "..." if len(current_task['task_id']) > 16 else current_task['task_id']
-            self.current_task_label.config(
-                text=f"Processing: {task_id}",
-                foreground="blue"
-            )
-
-            # Basic info
-            operation_type = (current_task['operation_type'] or 'unknown').upper()
-            self.operation_type_label.config(text=operation_type)
-
-            operation = current_task['operation_number'] or "--"
-            self.operation_label.config(text=operation)
-
-            date = current_task.get('date') or "--"
-            self.date_label.config(text=date)
-
             duration = current_task['duration']
             minutes = int(duration // 60)
             seconds = int(duration % 60)
             self.duration_label.config(text=f"{minutes:02d}:{seconds:02d}")
 
-            cash_register = current_task.get('cash_register') or "--"
-            self.cash_register_label.config(text=cash_register)
-
-            amount = current_task['amount']
-            if amount is not None:
-                self.amount_label.config(text=f"€{amount:.2f}")
-            else:
-                self.amount_label.config(text="--")
-
-            nature_display = current_task.get('nature_display') or "--"
-            self.nature_label.config(text=nature_display)
-
-            # Detailed info
-            third_party = current_task.get('third_party') or "--"
-            self.third_party_label.config(text=third_party)
-
-            description = current_task.get('description') or "--"
-            self.description_label.config(text=description)
-
-            # Line items progress
-            total_items = current_task.get('total_line_items', 0)
-            current_item = current_task.get('current_line_item', 0)
-            if total_items > 0:
-                progress_text = f"{current_item} of {total_items}"
-                if current_item > 0:
-                    percentage = (current_item / total_items) * 100
-                    progress_text += f" ({percentage:.0f}%)"
-                self.line_items_label.config(text=progress_text)
+        # The remaining labels only change with the status manager state
+        state_changed = status['state_version'] != self._displayed_state_version
+        self._displayed_state_version = status['state_version']
+        if state_changed:
+            # Update service status
+            if status['service_running']:
+                self.service_status_label.config(text="● RUNNING", foreground="green")
             else:
-                self.line_items_label.config(text="--")
-
-            line_details = current_task.get('line_item_details') or "--"
-            self.line_item_details_label.config(text=line_details)
-
-            step = current_task['current_step'] or "Processing..."
-            self.step_label.config(text=step)
-
-            # Display policy and token information
-            policy = current_task.get('duplicate_policy', 'abort_on_duplicate')
-            if policy:
-                policy_display = policy.replace('_', ' ').title()
-                # Color code based on policy type
-                policy_color = "black"
-                if policy == 'check_only':
-                    policy_color = "blue"
-                elif policy == 'force_create':
-                    policy_color = "orange"
-                elif policy == 'abort_on_duplicate':
-                    policy_color = "red"
-                self.policy_label.config(text=policy_display, foreground=policy_color)
-            else:
-                self.policy_label.config(text="Abort On Duplicate (default)", foreground="red")
-
-            # Display token with status color coding
-            token = current_task.get('duplicate_confirmation_token')
-            token_status = current_task.get('token_status', 'none')
-            if token:
-                # Truncate token for display
-                token_display = f"{token[:16]}...{token[-8:]}" if len(token) > 32 else token
-                token_display += f" [{token_status.upper()}]"
-
-                # Color code based on token status
-                token_color = "gray"
-                if token_status == 'received':
-                    token_color = "orange"  # Pending
-                elif token_status == 'validated':
-                    token_color = "blue"    # Validated
-                elif token_status == 'processing':
-                    token_color = "green"   # Processing
-                elif token_status == 'finalized':
-                    token_color = "gray"    # Completed
-
-                self.token_label.config(text=token_display, foreground=token_color)
+                self.service_status_label.config(text="● STOPPED", foreground="red")
+
+            # Update RabbitMQ status
+            if status['rabbitmq_connected']:
+                self.rabbitmq_status_label.config(text="● CONNECTED", foreground="green")
             else:
-                self.token_label.config(text="No token (N/A)", foreground="gray")
-        else:
-            # Check if there's a last completed task to display
-            last_completed = status.get('last_completed_task')
-            if last_completed:
-                # Show last completed task info in a muted style
-                task_id = last_completed['task_id'][:16] + "..." if len(last_completed['task_id']) > 16 else last_completed['task_id']
-                completion_status = last_completed.get('completion_status', 'COMPLETED')
+                self.rabbitmq_status_label.config(text="● DISCONNECTED", foreground="red")
+
+            # Update statistics
+            stats = status['stats']
+            self.pending_label.config(text=str(stats['pending']))
+            self.processing_label.config(text=str(stats['processing']))
+            self.completed_label.config(text=str(stats['completed']))
+            self.failed_label.config(text=str(stats['failed']))
+            self.success_rate_label.config(text=f"{status['success_rate']:.1f}%")
+
+            # Update current task
+            current_task = status['current_task']
+            if current_task:
+                task_id = current_task['task_id'][:16] + "..." if len(current_task['task_id']) > 16 else current_task['task_id']
                 self.current_task_label.config(
-                    text=f"Last: {task_id} - {completion_status}",
-                    foreground="gray"
+                    text=f"Processing: {task_id}",
+                    foreground="blue"
                 )
 
-                # Show basic info from last task
-                operation_type = (last_completed['operation_type'] or 'unknown').upper()
+                # Basic info
+                operation_type = (current_task['operation_type'] or 'unknown').upper()
                 self.operation_type_label.config(text=operation_type)
 
-                operation = last_completed['operation_number'] or "--"
+                operation = current_task['operation_number'] or "--"
                 self.operation_label.config(text=operation)
 
-                date = last_completed.get('date') or "--"
+                date = current_task.get('date') or "--"
                 self.date_label.config(text=date)
 
-                self.duration_label.config(text="--")
-
-                cash_register = last_completed.get('cash_register') or "--"
+                cash_register = current_task.get('cash_register') or "--"
                 self.cash_register_label.config(text=cash_register)
 
-                amount = last_completed['amount']
+                amount = current_task['amount']
                 if amount is not None:
                     self.amount_label.config(text=f"€{amount:.2f}")
                 else:
                     self.amount_label.config(text="--")
 
-                nature_display = last_completed.get('nature_display') or "--"
+                nature_display = current_task.get('nature_display') or "--"
                 self.nature_label.config(text=nature_display)
 
-                third_party = last_completed.get('third_party') or "--"
+                # Detailed info
+                third_party = current_task.get('third_party') or "--"
                 self.third_party_label.config(text=third_party)
 
-                description = last_completed.get('description') or "--"
+                description = current_task.get('description') or "--"
                 self.description_label.config(text=description)
 
-                total_items = last_completed.get('total_line_items', 0)
-                self.line_items_label.config(text=f"{total_items} items")
+                # Line items progress
+                total_items = current_task.get('total_line_items', 0)
+                current_item = current_task.get('current_line_item', 0)
+                if total_items > 0:
+                    progress_text = f"{current_item} of {total_items}"
+                    if current_item > 0:
+                        percentage = (current_item / total_items) * 100
+                        progress_text += f" ({percentage:.0f}%)"
+                    self.line_items_label.config(text=progress_text)
+                else:
+                    self.line_items_label.config(text="--")
+
+                line_details = current_task.get('line_item_details') or "--"
+                self.line_item_details_label.config(text=line_details)
 
-                self.line_item_details_label.config(text="--")
-                self.step_label.config(text=f"{completion_status}")
+                step = current_task['current_step'] or "Processing..."
+                self.step_label.config(text=step)
 
-                # Display retained policy and token info
-                policy = last_completed.get('duplicate_policy')
+                # Display policy and token information
+                policy = current_task.get('duplicate_policy', 'abort_on_duplicate')
                 if policy:
                     policy_display = policy.replace('_', ' ').title()
-                    self.policy_label.config(text=policy_display + " (Last task)", foreground="gray")
+                    # Color code based on policy type
+                    policy_color = "black"
+                    if policy == 'check_only':
+                        policy_color = "blue"
+                    elif policy == 'force_create':
+                        policy_color = "orange"
+                    elif policy == 'abort_on_duplicate':
+                        policy_color = "red"
+                    self.policy_label.config(text=policy_display, foreground=policy_color)
                 else:
-                    self.policy_label.config(text="--", foreground="gray")
+                    self.policy_label.config(text="Abort On Duplicate (default)", foreground="red")
 
-                token = last_completed.get('duplicate_confirmation_token')
-                token_status = last_completed.get('token_status', 'finalized')
+                # Display token with status color coding
+                token = current_task.get('duplicate_confirmation_token')
+                token_status = current_task.get('token_status', 'none')
                 if token:
+                    # Truncate token for display
                     token_display = f"{token[:16]}...{token[-8:]}" if len(token) > 32 else token
                     token_display += f" [{token_status.upper()}]"
-                    self.token_label.config(text=token_display, foreground="gray")
+
+                    # Color code based on token status
+                    token_color = "gray"
+                    if token_status == 'received':
+                        token_color = "orange"  # Pending
+                    elif token_status == 'validated':
+                        token_color = "blue"    # Validated
+                    elif token_status == 'processing':
+                        token_color = "green"   # Processing
+                    elif token_status == 'finalized':
+                        token_color = "gray"    # Completed
+
+                    self.token_label.config(text=token_display, foreground=token_color)
                 else:
-                    self.token_label.config(text="No token (Last task)", foreground="gray")
+                    self.token_label.config(text="No token (N/A)", foreground="gray")
             else:
-                # No current task and no last completed task
-                self.current_task_label.config(
-                    text="No task currently processing",
-                    foreground="gray"
-                )
-                self.operation_type_label.config(text="--")
-                self.operation_label.config(text="--")
-                self.date_label.config(text="--")
-                self.duration_label.config(text="--")
-                self.cash_register_label.config(text="--")
-                self.amount_label.config(text="--")
-                self.nature_label.config(text="--")
-                self.third_party_label.config(text="--")
-                self.description_label.config(text="--")
-                self.line_items_label.config(text="--")
-                self.line_item_details_label.config(text="--")
-                self.step_label.config(text="--")
-                self.policy_label.config(text="--", foreground="gray")
-                self.token_label.config(text="--", foreground="gray")
-
-        # Update logs
-        recent_logs = status['recent_logs']
-        if recent_logs:
+                # Check if there's a last completed task to display
+                last_completed = status.get('last_completed_task')
+                if last_completed:
+                    # Show last completed task info in a muted style
+                    task_id = last_completed['task_id'][:16] + "..." if len(last_completed['task_id']) > 16 else last_completed['task_id']
+                    completion_status = last_completed.get('completion_status', 'COMPLETED')
+                    self.current_task_label.config(
+                        text=f"Last: {task_id} - {completion_status}",
+                        foreground="gray"
+                    )
+
+                    # Show basic info from last task
+                    operation_type = (last_completed['operation_type'] or 'unknown').upper()
+                    self.operation_type_label.config(text=operation_type)
+
+                    operation = last_completed['operation_number'] or "--"
+                    self.operation_label.config(text=operation)
+
+                    date = last_completed.get('date') or "--"
+                    self.date_label.config(text=date)
+
+                    self.duration_label.config(text="--")
+
+                    cash_register = last_completed.get('cash_register') or "--"
+                    self.cash_register_label.config(text=cash_register)
+
+                    amount = last_completed['amount']
+                    if amount is not None:
+                        self.amount_label.config(text=f"€{amount:.2f}")
+                    else:
+                        self.amount_label.config(text="--")
+
+                    nature_display = last_completed.get('nature_display') or "--"
+                    self.nature_label.config(text=nature_display)
+
+                    third_party = last_completed.get('third_party') or "--"
+                    self.third_party_label.config(text=third_party)
+
+                    description = last_completed.get('description') or "--"
+                    self.description_label.config(text=description)
+
+                    total_items = last_completed.get('total_line_items', 0)
+                    self.line_items_label.config(text=f"{total_items} items")
+
+                    self.line_item_details_label.config(text="--")
+                    self.step_label.config(text=f"{completion_status}")
+
+                    # Display retained policy and token info
+                    policy = last_completed.get('duplicate_policy')
+                    if policy:
+                        policy_display = policy.replace('_', ' ').title()
+                        self.policy_label.config(text=policy_display + " (Last task)", foreground="gray")
+                    else:
+                        self.policy_label.config(text="--", foreground="gray")
+
+                    token = last_completed.get('duplicate_confirmation_token')
+                    token_status = last_completed.get('token_status', 'finalized')
+                    if token:
+                        token_display = f"{token[:16]}...{token[-8:]}" if len(token) > 32 else token
+                        token_display += f" [{token_status.upper()}]"
+                        self.token_label.config(text=token_display, foreground="gray")
+                    else:
+                        self.token_label.config(text="No token (Last task)", foreground="gray")
+                else:
+                    # No current task and no last completed task
+                    self.current_task_label.config(
+                        text="No task currently processing",
+                        foreground="gray"
+                    )
+                    self.operation_type_label.config(text="--")
+                    self.operation_label.config(text="--")
+                    self.date_label.config(text="--")
+                    self.duration_label.config(text="--")
+                    self.cash_register_label.config(text="--")
+                    self.amount_label.config(text="--")
+                    self.nature_label.config(text="--")
+                    self.third_party_label.config(text="--")
+                    self.description_label.config(text="--")
+                    self.line_items_label.config(text="--")
+                    self.line_item_details_label.config(text="--")
+                    self.step_label.config(text="--")
+                    self.policy_label.config(text="--", foreground="gray")
+                    self.token_label.config(text="--", foreground="gray")
+
+        # Update logs, only when new log lines have arrived since the last tick
+        recent_logs = status['recent_logs_typed']
+        logs_changed = status['log_version'] != self._displayed_log_version
+        self._displayed_log_version = status['log_version']
+        if recent_logs and logs_changed:
             # Get current text
             current_logs = self.log_text.get("1.0", tk.END).strip()
-            new_logs = "\n".join(recent_logs)
+            new_logs = "\n".join(log for log, _, _ in recent_logs)
 
             # Only update if changed
             if current_logs != new_logs:
                 self.log_text.config(state=tk.NORMAL)
                 self.log_text.delete("1.0", tk.END)
 
-                for log in recent_logs:
-                    # Determine tag based on log level
-                    tag = "INFO"
-                    if "[ERROR]" in log or "[CRITICAL]" in log:
-                        tag = "ERROR"
-                    elif "[WARNING]" in log:
-                        tag = "WARNING"
-                    elif "[DEBUG]" in log:
-                        tag = "DEBUG"
-
-                    self.log_text.insert(tk.END, log + "\n", tag)
+                lines = [(log, LOG_LEVEL_TAGS.get(level, "INFO")) for log, level, _ in recent_logs]
+                self.log_text.insert(tk.END, *self._tagged_runs(lines))
 
                 # Auto-scroll to bottom
                 self.log_text.see(tk.END)
                 self.log_text.config(state=tk.DISABLED)
 
         # Update complete logs tab if it exists
-        if hasattr(self, 'complete_log_text'):
+        if logs_changed and hasattr(self, 'complete_log_text'):
             # Only update if the logs tab is visible or auto-refresh is needed
             try:
                 self.refresh_complete_logs()
@@ -1255,7 +1363,7 @@ class GastosGUI:
         self.root.after(500, self.update_display)
 
     def load_history(self):
-        """Load task history from database."""
+        """Load the first page of task history from the database."""
         try:
             db = get_task_history_db()
 
@@ -1272,70 +1380,15 @@ class GastosGUI:
             }
             status_db = status_map.get(status_filter_value)
 
-            # Get tasks from database
-            if search_term:
-                tasks = db.search_tasks(search_term, limit=500)
-                # Apply status filter if needed
-                if status_db:
-                    tasks = [t for t in tasks if t.get('status') == status_db]
-            else:
-                tasks = db.get_all_tasks(limit=500, status_filter=status_db)
-
-            # Clear existing items
-            for item in self.history_tree.get_children():
-                self.history_tree.delete(item)
-
-            # Populate tree
-            for task in tasks:
-                # Format values
-                task_id = task.get('task_id', '--')[:30]
-                operation_type = (task.get('operation_type', '--') or '--').upper()
-                operation = task.get('operation_number', '--')
-                date = task.get('date', '--')
-                amount = f"€{task.get('amount', 0):.2f}" if task.get('amount') else "--"
-                cash_reg = task.get('cash_register', '--')
-                third_party = (task.get('third_party', '--') or '--')[:25]
-
-                # Nature display
-                nature = task.get('nature')
-                if nature in ('1', '2', '3', '4'):
-                    nature_display = "Presupuestary"
-                elif nature == '5':
-                    nature_display = "Non-presupuestary"
-                else:
-                    nature_display = nature or "--"
+            # Start a new listing; later pages reuse these filters
+            self._history_query = (search_term or None, status_db)
+            self._history_cursor = 0
+            self._history_exhausted = False
 
-                status = (task.get('status', '--') or '--').capitalize()
+            # Clear existing items in one call
+            self.history_tree.delete(*self.history_tree.get_children())
 
-                # Duration
-                duration_sec = task.get('duration_seconds')
-                if duration_sec:
-                    minutes = int(duration_sec // 60)
-                    seconds = int(duration_sec % 60)
-                    duration = f"{minutes:02d}:{seconds:02d}"
-                else:
-                    duration = "--"
-
-                # Completed at
-                completed_at = task.get('completed_at', '--')
-                if completed_at and completed_at != '--':
-                    try:
-                        # Format datetime if it's a timestamp
-                        if isinstance(completed_at, str):
-                            dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
-                            completed_at = dt.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        pass
-
-                # Insert with tag for coloring
-                tag = task.get('status', '').lower()
-                self.history_tree.insert(
-                    "",
-                    0,  # Insert at beginning (most recent first)
-                    values=(task_id, operation_type, operation, date, amount, cash_reg,
-                           third_party, nature_display, status, duration, completed_at),
-                    tags=(tag,)
-                )
+            tasks = self._load_next_history_page()
 
             # Update statistics
             stats = db.get_statistics()
@@ -1357,6 +1410,87 @@ class GastosGUI:
             status_manager.add_log(f"Failed to load history: {e}", "ERROR")
             messagebox.showerror("Error", f"Failed to load history:\n{e}")
 
+    def _load_next_history_page(self) -> list:
+        """Append the next page of the current history listing to the table."""
+        if self._history_exhausted:
+            return []
+
+        search_term, status_db = self._history_query
+        tasks = get_task_history_db().get_page(
+            limit=HISTORY_PAGE_SIZE,
+            offset=self._history_cursor,
+            search_term=search_term,
+            status_filter=status_db
+        )
+        self._history_cursor += len(tasks)
+        self._history_exhausted = len(tasks) < HISTORY_PAGE_SIZE
+
+        # Populate tree (pages arrive most recent first)
+        for task in tasks:
+            # Format values
+            task_id = task.get('task_id', '--')[:30]
+            operation_type = (task.get('operation_type', '--') or '--').upper()
+            operation = task.get('operation_number', '--')
+            date = task.get('date', '--')
+            amount = f"€{task.get('amount', 0):.2f}" if task.get('amount') else "--"
+            cash_reg = task.get('cash_register', '--')
+            third_party = (task.get('third_party', '--') or '--')[:25]
+
+            # Nature display
+            nature = task.get('nature')
+            if nature in ('1', '2', '3', '4'):
+                nature_display = "Presupuestary"
+            elif nature == '5':
+                nature_display = "Non-presupuestary"
+            else:
+                nature_display = nature or "--"
+
+            status = (task.get('status', '--') or '--').capitalize()
+
+            # Duration
+            duration_sec = task.get('duration_seconds')
+            if duration_sec:
+                minutes = int(duration_sec // 60)
+                seconds = int(duration_sec % 60)
+                duration = f"{minutes:02d}:{seconds:02d}"
+            else:
+                duration = "--"
+
+            # Completed at
+            completed_at = task.get('completed_at', '--')
+            if completed_at and completed_at != '--':
+                try:
+                    # Format datetime if it's a timestamp
+                    if isinstance(completed_at, str):
+                        dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+                        completed_at = dt.strftime("%Y-%m-%d %H:%M:%S")
+                except:
+                    pass
+
+            # Insert with tag for coloring
+            tag = task.get('status', '').lower()
+            self.history_tree.insert(
+                "",
+                tk.END,  # Append: each page is older than the rows above it
+                values=(task_id, operation_type, operation, date, amount, cash_reg,
+                       third_party, nature_display, status, duration, completed_at),
+                tags=(tag,)
+            )
+
+        return tasks
+
+    def on_history_yscroll(self, first, last):
+        """Update the scrollbar and load the next history page near the end."""
+        self.history_scroll_y.set(first, last)
+        if float(last) >= 0.9 and not self._history_exhausted and self._history_page_after_id is None:
+            # Deferred: this runs inside Treeview's own scroll update
+            self._history_page_after_id = self.root.after_idle(self._load_scrolled_history_page)
+
+    def _load_scrolled_history_page(self):
+        """Load the page requested by on_history_yscroll."""
+        self._history_page_after_id = None
+        self._load_next_history_page()
+
     def on_history_row_double_click(self, event):
         """Handle double-click on history row to show details."""
         selection = self.history_tree.selection()
@@ -6,7 +6,20 @@ Each processor handles a specific operation (ADO220, PMP450, etc.) following
 the common base class pattern.
 """
 
-from .ado220_processor import ADO220Processor
-from .pmp450_processor import PMP450Processor
+import importlib
 
 __all__ = ['ADO220Processor', 'PMP450Processor']
+
+# Processor classes are imported lazily so that loading one processor
+# module does not pull in the others.
+_LAZY_IMPORTS = {
+    'ADO220Processor': '.ado220_processor',
+    'PMP450Processor': '.pmp450_processor',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -14,6 +14,8 @@ from robocorp import windows
 from sical_base import (
     SicalOperationProcessor,
     SicalWindowManager,
+    ConsultaWindowManager,
+    TesoreriaPagosWindowManager,
     OperationResult,
     OperationStatus,
 )
@@ -40,8 +42,11 @@ from sical_utils import (
     extract_caja_code,
     check_finalize_flag,
     show_windows_message_box,
+    confirm_repeated_dialogs,
     find_element_with_fallback,
     handle_error_cleanup,
+    paste_text,
+    wait_for_window,
 )
 from sical_security import (
     get_confirmation_manager,
@@ -58,22 +63,6 @@ class ADO220WindowManager(SicalWindowManager):
         return SICAL_WINDOWS['ado220']
 
 
-class ConsultaWindowManager(SicalWindowManager):
-    """Window manager for Consulta operation windows."""
-
-    @property
-    def window_pattern(self) -> str:
-        return SICAL_WINDOWS['consulta']
-
-
-class TesoreriaPagosWindowManager(SicalWindowManager):
-    """Window manager for Tesoreria Pagos windows."""
-
-    @property
-    def window_pattern(self) -> str:
-        return SICAL_WINDOWS['tesoreria']
-
-
 class ADO220Processor(SicalOperationProcessor):
     """
     Processor for ADO220 expense operations.
@@ -110,7 +99,7 @@ class ADO220Processor(SicalOperationProcessor):
         """
         # Extract texto field from texto_sical array
         texto_sical = operation_data.get('texto_sical', [])
-        if texto_sical and len(texto_sical) > 0:
+        if texto_sical:
             texto_operacion = str(texto_sical[0].get('texto_ado', DEFAULT_OPERATION_VALUES['texto']))
         else:
             texto_operacion = DEFAULT_OPERATION_VALUES['texto']
@@ -120,6 +109,7 @@ class ADO220Processor(SicalOperationProcessor):
 
         # Convert fecha from DD/MM/YYYY to DDMMYYYY format
         fecha = transform_date_to_sical_format(operation_data.get('fecha', ''))
+        fecha_ordenamiento = operation_data.get('fecha_ordenamiento', fecha)
 
         # Extract caja code
         caja_raw = operation_data.get('caja', DEFAULT_OPERATION_VALUES['caja'])
@@ -140,8 +130,8 @@ class ADO220Processor(SicalOperationProcessor):
             'aux_data': operation_data.get('aux_data', {}),
             'metadata': operation_data.get('metadata', {}),
             # Keep original data for payment ordering
-            'fecha_ordenamiento': operation_data.get('fecha_ordenamiento', fecha),
-            'fecha_pago': operation_data.get('fecha_pago', operation_data.get('fecha_ordenamiento', fecha)),
+            'fecha_ordenamiento': fecha_ordenamiento,
+            'fecha_pago': operation_data.get('fecha_pago', fecha_ordenamiento),
             # Security: Duplicate handling policy and token
             'duplicate_policy': operation_data.get('duplicate_policy', 'abort_on_duplicate'),
             'duplicate_confirmation_token': operation_data.get('duplicate_confirmation_token'),
@@ -159,14 +149,15 @@ class ADO220Processor(SicalOperationProcessor):
             List of aplicaciones in SICAL-compatible format
         """
         aplicaciones = []
+        get_cuenta_pgp = PARTIDAS_GASTO_CUENTA_PGP.get
         for aplicacion in aplicaciones_data:
             economica = str(aplicacion['economica'])
 
             # Prefer cuenta_pgp from message, fallback to mapping table
-            if 'cuenta_pgp' in aplicacion and aplicacion['cuenta_pgp']:
-                cuenta = str(aplicacion['cuenta_pgp'])
+            if cuenta_pgp := aplicacion.get('cuenta_pgp'):
+                cuenta = str(cuenta_pgp)
             else:
-                cuenta = PARTIDAS_GASTO_CUENTA_PGP.get(economica, DEFAULT_CUENTA_PGP)
+                cuenta = get_cuenta_pgp(economica, DEFAULT_CUENTA_PGP)
 
             importe = str(aplicacion['importe'])
 
@@ -199,8 +190,12 @@ class ADO220Processor(SicalOperationProcessor):
                 self.logger.error(f'Unable to open ADO220 window via menu: {menu_path}')
                 return False
 
-        self.window_manager.ventana_proceso = self.window_manager.find_proceso_window()
-        self.logger.debug(f'ADO220 window: {self.window_manager.ventana_proceso}')
+        self.window_manager.ventana_proceso = wait_for_window(
+            self.window_manager.window_pattern,
+            timeout=DEFAULT_TIMING['window_open_timeout'],
+            retry_interval=DEFAULT_TIMING['short_wait']
+        )
+        self.logger.debug('ADO220 window: %s', self.window_manager.ventana_proceso)
         return bool(self.window_manager.ventana_proceso)
 
     def check_for_duplicates_pre_window(
@@ -420,92 +415,6 @@ class ADO220Processor(SicalOperationProcessor):
 
         return result
 
-    def _setup_consulta_window(self, window_manager: ConsultaWindowManager) -> bool:
-        """Setup the Consulta operations window."""
-        menu_path = SICAL_MENU_PATHS['consulta']
-
-        if not open_menu_option(menu_path, self.logger):
-            time.sleep(3)
-            if not open_menu_option(menu_path, self.logger):
-                self.logger.error(f'Unable to open Consulta window: {menu_path}')
-                return False
-
-        time.sleep(2)
-        window_manager.ventana_proceso = window_manager.find_proceso_window()
-        self.logger.debug(f'Consulta window: {window_manager.ventana_proceso}')
-        return bool(window_manager.ventana_proceso)
-
-    def _fill_duplicate_check_filters(
-        self,
-        filtros_window,
-        operation_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Fill the filter fields for duplicate checking.
-
-        Returns:
-            Dictionary with search criteria used
-        """
-        wait_time = DEFAULT_TIMING['short_wait']
-        interval = DEFAULT_TIMING['short_wait']
-
-        # Build search criteria dictionary
-        search_criteria = {
-            'tercero': operation_data['tercero'],
-            'fecha': operation_data['fecha'],
-            'caja': operation_data['caja']
-        }
-
-        # Tercero
-        tercero_field = filtros_window.find(FILTROS_FORM_PATHS['tercero'])
-        tercero_field.double_click()
-        tercero_field.send_keys(operation_data['tercero'], interval=interval, wait_time=wait_time, send_enter=True)
-
-        # Date range (same date for from and to)
-        fecha = operation_data['fecha']
-        from_date_field = filtros_window.find(FILTROS_FORM_PATHS['fecha_desde'])
-        from_date_field.double_click()
-        from_date_field.send_keys(fecha, interval=0.01, wait_time=wait_time, send_enter=True)
-
-        to_date_field = filtros_window.find(FILTROS_FORM_PATHS['fecha_hasta'])
-        to_date_field.double_click()
-        to_date_field.send_keys(fecha, interval=0.01, wait_time=wait_time, send_enter=True)
-
-        # Aplicacion (first one)
-        if operation_data.get('aplicaciones'):
-            first_app = operation_data['aplicaciones'][0]
-
-            search_criteria.update({
-                'funcional': first_app['funcional'],
-                'economica': first_app['economica'],
-                'importe_min': first_app['importe'],
-                'importe_max': first_app['importe']
-            })
-
-            funcional_field = filtros_window.find(FILTROS_FORM_PATHS['funcional'])
-            funcional_field.double_click()
-            funcional_field.send_keys(first_app['funcional'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-            economica_field = filtros_window.find(FILTROS_FORM_PATHS['economica'])
-            economica_field.double_click()
-            economica_field.send_keys(first_app['economica'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-            # Amount range
-            importe_desde = filtros_window.find(FILTROS_FORM_PATHS['importe_desde'])
-            importe_desde.double_click()
-            importe_desde.send_keys(first_app['importe'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-            importe_hasta = filtros_window.find(FILTROS_FORM_PATHS['importe_hasta'])
-            importe_hasta.double_click()
-            importe_hasta.send_keys(first_app['importe'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-        # Caja
-        caja_field = filtros_window.find(FILTROS_FORM_PATHS['caja'])
-        caja_field.click()
-        caja_field.send_keys(operation_data['caja'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-        return search_criteria
-
     def _enter_operation_data(
         self,
         operation_data: Dict[str, Any],
@@ -580,12 +489,14 @@ class ADO220Processor(SicalOperationProcessor):
         ventana.find(ADO220_FORM_PATHS['tesoreria_check']).click(wait_time=wait_time)
 
         # Forma de pago (with fallback for alternate path)
-        forma_pago = find_element_with_fallback(
-            ventana,
-            ADO220_FORM_PATHS['forma_pago_primary'],
-            ADO220_FORM_PATHS['forma_pago_alternate'],
-            raise_error=True
-        )
+        forma_pago = ventana.find(ADO220_FORM_PATHS['forma_pago_primary'], raise_error=False)
+        # The payment fields share one panel: once its path variant is known,
+        # try that variant first for tipo de pago and caja
+        if forma_pago:
+            first, second = 'primary', 'alternate'
+        else:
+            first, second = 'alternate', 'primary'
+            forma_pago = ventana.find(ADO220_FORM_PATHS['forma_pago_alternate'])
         forma_pago.double_click(wait_time=wait_time)
         forma_pago.send_keys(keys=operation_data['fpago'], interval=0.01, wait_time=wait_time)
         forma_pago.send_keys(keys='{Enter}', wait_time=wait_time)
@@ -593,8 +504,8 @@ class ADO220Processor(SicalOperationProcessor):
         # Tipo de pago
         tipo_pago = find_element_with_fallback(
             ventana,
-            ADO220_FORM_PATHS['tipo_pago_primary'],
-            ADO220_FORM_PATHS['tipo_pago_alternate'],
+            ADO220_FORM_PATHS[f'tipo_pago_{first}'],
+            ADO220_FORM_PATHS[f'tipo_pago_{second}'],
             raise_error=True
         )
         tipo_pago.double_click(wait_time=wait_time)
@@ -604,8 +515,8 @@ class ADO220Processor(SicalOperationProcessor):
         # Caja
         caja_element = find_element_with_fallback(
             ventana,
-            ADO220_FORM_PATHS['caja_primary'],
-            ADO220_FORM_PATHS['caja_alternate'],
+            ADO220_FORM_PATHS[f'caja_{first}'],
+            ADO220_FORM_PATHS[f'caja_{second}'],
             raise_error=True
         )
         caja_element.click(wait_time=wait_time)
@@ -614,7 +525,7 @@ class ADO220Processor(SicalOperationProcessor):
         # Texto (description)
         texto_element = ventana.find(ADO220_FORM_PATHS['texto']).double_click()
         texto_element.send_keys(keys='{Ctrl}{A}', wait_time=wait_time)
-        texto_element.send_keys(operation_data['texto'], wait_time=DEFAULT_TIMING['default_wait'])
+        paste_text(texto_element, operation_data['texto'])
         texto_element.send_keys(keys='{Enter}', wait_time=wait_time)
 
     def _fill_aplicaciones(
@@ -639,10 +550,14 @@ class ADO220Processor(SicalOperationProcessor):
         # Click on aplicaciones grid
         ventana.find(ADO220_FORM_PATHS['aplicaciones_grid']).double_click()
 
+        # The line buttons stay in place while rows are added; look them up once
+        new_line_button = ventana.find(ADO220_FORM_PATHS['new_line_button'])
+        confirm_line_button = ventana.find(ADO220_FORM_PATHS['confirm_line_button'])
+
         suma_aplicaciones = 0.0
 
         for i, aplicacion in enumerate(aplicaciones):
-            self.logger.debug(f'Processing aplicacion {i + 1}: {aplicacion}')
+            self.logger.debug('Processing aplicacion %s: %s', i + 1, aplicacion)
             self.notify_step(
                 f'Processing line item {i + 1} of {len(aplicaciones)}',
                 current_line_item=i + 1,
@@ -651,7 +566,7 @@ class ADO220Processor(SicalOperationProcessor):
             )
 
             # Click "Nuevo" button for new line
-            ventana.find(ADO220_FORM_PATHS['new_line_button']).click()
+            new_line_button.click()
 
             # Fill line item fields
             ventana.send_keys(keys='{Tab}', interval=0.05, wait_time=default_wait, send_enter=False)
@@ -671,7 +586,7 @@ class ADO220Processor(SicalOperationProcessor):
             ventana.send_keys(keys=aplicacion['cuenta'], interval=default_wait, wait_time=DEFAULT_TIMING['default_wait'])
 
             # Confirm line item
-            ventana.find(ADO220_FORM_PATHS['confirm_line_button']).click()
+            confirm_line_button.click()
 
             # Track sum
             try:
@@ -698,7 +613,7 @@ class ADO220Processor(SicalOperationProcessor):
         result.status = OperationStatus.PENDING
 
         try:
-            self.logger.info(f'Validating ADO operation in window: {ventana}')
+            self.logger.info('Validating ADO operation in window: %s', ventana)
             ventana.find(ADO220_FORM_PATHS['validar_button']).click(wait_time=DEFAULT_TIMING['default_wait'])
 
             # Confirm validation
@@ -774,7 +689,7 @@ class ADO220Processor(SicalOperationProcessor):
 
             # Enter operation number
             campo_id = ventana_consulta.find(CONSULTA_FORM_PATHS['id_operacion'])
-            campo_id.send_keys(num_operacion, interval=0.1, wait_time=DEFAULT_TIMING['default_wait'], send_enter=True)
+            paste_text(campo_id, num_operacion, wait_time=DEFAULT_TIMING['default_wait'], send_enter=True)
 
             # Click print button
             ventana_consulta.find(CONSULTA_FORM_PATHS['imprimir_button']).click()
@@ -849,13 +764,14 @@ class ADO220Processor(SicalOperationProcessor):
                 return result
 
             # Prepare payment data
+            fecha_ordenamiento = operation_data.get('fecha_ordenamiento', operation_data['fecha'])
             datos_pago = {
                 'num_operacion': num_operacion,
-                'fecha_ordenamiento': operation_data.get('fecha_ordenamiento', operation_data['fecha']),
-                'fecha_pago': operation_data.get('fecha_pago', operation_data.get('fecha_ordenamiento', operation_data['fecha']))
+                'fecha_ordenamiento': fecha_ordenamiento,
+                'fecha_pago': operation_data.get('fecha_pago', fecha_ordenamiento)
             }
 
-            self.logger.info(f'Payment data: {datos_pago}')
+            self.logger.info('Payment data: %s', datos_pago)
 
             # Execute payment ordering
             result = self._execute_payment_ordering(pagos_manager.ventana_proceso, datos_pago, result)
@@ -876,8 +792,12 @@ class ADO220Processor(SicalOperationProcessor):
         if not open_menu_option(menu_path, self.logger):
             return False
 
-        window_manager.ventana_proceso = window_manager.find_proceso_window()
-        self.logger.debug(f'Tesoreria window: {window_manager.ventana_proceso}')
+        window_manager.ventana_proceso = wait_for_window(
+            window_manager.window_pattern,
+            timeout=DEFAULT_TIMING['window_open_timeout'],
+            retry_interval=DEFAULT_TIMING['short_wait']
+        )
+        self.logger.debug('Tesoreria window: %s', window_manager.ventana_proceso)
         return bool(window_manager.ventana_proceso)
 
     def _execute_payment_ordering(
@@ -918,7 +838,7 @@ class ADO220Processor(SicalOperationProcessor):
 
             # Enter operation number
             num_op_element = ventana.find(TESORERIA_PAGOS_PATHS['num_operacion_input']).click(wait_time=0.2)
-            num_op_element.send_keys(datos_pago['num_operacion'], interval=0.1, wait_time=0.5, send_enter=True)
+            paste_text(num_op_element, datos_pago['num_operacion'], wait_time=0.5, send_enter=True)
 
             # Check if operation is already ordered
             modal_error = ventana.find('class:"TMessageForm" and name:"Error"', timeout=1.0, raise_error=False)
@@ -962,9 +882,7 @@ class ADO220Processor(SicalOperationProcessor):
         ventana.find(TESORERIA_PAGOS_PATHS['validar_mto_button']).click(wait_time=0.2)
 
         # Confirm dialogs
-        ventana.find(COMMON_DIALOG_PATHS['confirm_yes_alt']).click(wait_time=0.2)
-        ventana.find(COMMON_DIALOG_PATHS['confirm_yes_alt']).click(wait_time=0.2)
-        ventana.find(COMMON_DIALOG_PATHS['confirm_yes_alt']).click(wait_time=0.2)
+        confirm_repeated_dialogs(ventana, COMMON_DIALOG_PATHS['confirm_yes_alt'], 3, wait_time=DEFAULT_TIMING['default_wait'])
 
         # Print dialog
         ventana_imprimir = windows.find_window(SICAL_WINDOWS['print_dialog'])
@@ -983,7 +901,7 @@ class ADO220Processor(SicalOperationProcessor):
 
         # Enter operation number
         num_op_element = ventana.find(TESORERIA_PAGOS_PATHS['num_operacion_input']).click(wait_time=0.2)
-        num_op_element.send_keys(datos_pago['num_operacion'], interval=0.1, wait_time=0.5, send_enter=True)
+        paste_text(num_op_element, datos_pago['num_operacion'], wait_time=0.5, send_enter=True)
 
         # Validate payment
         ventana.find(TESORERIA_PAGOS_PATHS['validar_op_button']).click(wait_time=1.0)
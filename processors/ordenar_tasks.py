@@ -1,7 +1,7 @@
 import datetime
 from robocorp.tasks import task
 from robocorp import windows
-import time, os, json
+import time, json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
@@ -10,18 +10,20 @@ from enum import Enum
 import logging
 from robocorp import windows
 from robocorp.tasks import task
-from sical_base import OperationEncoder, OperationResult, OperationStatus
+from sical_base import OperationEncoder, OperationResult, OperationStatus, TesoreriaPagosWindowManager
+from sical_constants import COMMON_DIALOG_PATHS, DEFAULT_TIMING, SICAL_WINDOWS
+from sical_utils import confirm_repeated_dialogs, paste_text
 
 ###########
 ### ORDENAR Y PAGAR
 ###########
 
-ROBOT_DIR = Path(__file__).parent.absolute()
+ROBOT_DIR = Path(__file__).resolve().parent
 DATA_FOLDER_NAME = 'data'
-DATA_DIR = os.path.join(ROBOT_DIR, DATA_FOLDER_NAME)
-PENDING_DIR = os.path.join(DATA_DIR, 'pending')
-PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
-FAILED_DIR = os.path.join(DATA_DIR, 'z_failed')
+DATA_DIR = ROBOT_DIR / DATA_FOLDER_NAME
+PENDING_DIR = DATA_DIR / 'pending'
+PROCESSED_DIR = DATA_DIR / 'processed'
+FAILED_DIR = DATA_DIR / 'z_failed'
 
 
 # Configure logging
@@ -34,25 +36,6 @@ logging.basicConfig(
 gasto_logger = logging.getLogger(__name__)
 
 
-
-class TesoreriaPagosSicalWindowManager:
-    def __init__(self):
-        self.ventana_proceso = None
-        
-    def find_proceso_window(self):
-        nombre_ventana_tesoreriapagos = 'regex:.*SICAL II 4.2 TesPagos'
-        return windows.find_window(f'{nombre_ventana_tesoreriapagos}', raise_error=False)
-    
-    def close_window(self):
-        if self.ventana_proceso:
-            try:
-                boton_cerrar = self.ventana_proceso.find('name:"Cerrar"', search_depth=8, raise_error=False)
-                if boton_cerrar:
-                    boton_cerrar.click()
-                    self.ventana_proceso.find('class:"TButton" and name:"No"').click()
-            except Exception as e:
-                gasto_logger.exception("Error closing window: %s", str(e))
-
 @task()
 def prueba_pago():
     operation_data =  {
@@ -87,7 +70,7 @@ def ordenarypagar_gasto(operation_data: Dict[str, Any]) -> OperationResult:
         OperationResult: Object containing the operation results and status
     """
 
-    print('Entry Ordenar y Pagar: ', operation_data)
+    gasto_logger.debug('Entry Ordenar y Pagar: %s', operation_data)
     init_time = datetime.now()
     result = OperationResult(
         status=OperationStatus.PENDING,
@@ -95,13 +78,13 @@ def ordenarypagar_gasto(operation_data: Dict[str, Any]) -> OperationResult:
         sical_is_open=False
     )
     
-    window_manager = TesoreriaPagosSicalWindowManager()
+    window_manager = TesoreriaPagosWindowManager(gasto_logger)
     
     try:
         # Prepare operation data
         datos_pago = create_pago_data(operation_data)
 
-        print('Created TESORERIA PAGOS data: ', datos_pago)
+        gasto_logger.debug('Created TESORERIA PAGOS data: %s', datos_pago)
         # Setup SICAL window
         if not setup_sical_window(window_manager):
             result.status = OperationStatus.FAILED
@@ -168,14 +151,14 @@ def create_pago_data(operation_data: Dict[str, Any]) -> Dict[str, Any]:
         'fecha_pago': fecha_pago,
     }
 
-def setup_sical_window(window_manager: TesoreriaPagosSicalWindowManager) -> bool:
+def setup_sical_window(window_manager: TesoreriaPagosWindowManager) -> bool:
     """Setup SICAL window for operation"""
     rama_tesoreria_pagos = ('TESORERIA', 'GESTION DE PAGOS', 'PROCESO DE ORDENACION Y PAGO')
     if not abrir_ventana_opcion_en_menu(rama_tesoreria_pagos):
         return False
     
     window_manager.ventana_proceso = window_manager.find_proceso_window()
-    gasto_logger.debug(f"VENTANA proceso {window_manager.ventana_proceso}")
+    gasto_logger.debug("VENTANA proceso %s", window_manager.ventana_proceso)
     return bool(window_manager.ventana_proceso)
 
 
@@ -184,78 +167,70 @@ def ordenar_y_pagar_operacion_gasto(ventana_proceso, datos_pago: Dict[str, Any],
     
     try:
         fecha_ordenpago_el = ventana_proceso.find('class:"TMaskEdit" and path:"2|1|1"')
-        fecha_ordenpago_el.send_keys(datos_pago['fecha_ordenamiento'], interval=0.1, wait_time=0.5, send_enter=True)
-        modal_cambio_fecha_ok = ventana_proceso.find('class:"TButton" and name:"OK" and path:"1|1"', raise_error=False)
+        fecha_ordenpago_el.send_keys(datos_pago['fecha_ordenamiento'], interval=DEFAULT_TIMING['slow_key_interval'], wait_time=DEFAULT_TIMING['medium_wait'], send_enter=True)
+        modal_cambio_fecha_ok = ventana_proceso.find(COMMON_DIALOG_PATHS['info_ok_alt'], raise_error=False)
         if modal_cambio_fecha_ok:
-            modal_cambio_fecha_ok.click(wait_time=0.5)
+            modal_cambio_fecha_ok.click(wait_time=DEFAULT_TIMING['medium_wait'])
 
-        boton_ordenar = ventana_proceso.find('name:"Ordenar" and path:"2|7"').click(wait_time=0.8)
+        boton_ordenar = ventana_proceso.find('name:"Ordenar" and path:"2|7"').click(wait_time=DEFAULT_TIMING['dialog_wait'])
 
         if not datos_pago['num_lista']:
             option_operation_el = ventana_proceso.find('name:"Nº Operación" and class:"TGroupButton"')
-            option_operation_el.click(wait_time=0.5)
-            num_operation_el = ventana_proceso.find('class:"TEdit" and path:"1|1|4"').click(wait_time=0.2)
-            num_operation_el.send_keys(datos_pago['num_operacion'], interval=0.1, wait_time=0.5, send_enter=True)
+            option_operation_el.click(wait_time=DEFAULT_TIMING['medium_wait'])
+            num_operation_el = ventana_proceso.find('class:"TEdit" and path:"1|1|4"').click(wait_time=DEFAULT_TIMING['default_wait'])
+            paste_text(num_operation_el, datos_pago['num_operacion'], wait_time=DEFAULT_TIMING['medium_wait'], send_enter=True)
 
             #Si al introducir la operacion ya está pagada aparece error
             modal_error_ya_ordenado = ventana_proceso.find('class:"TMessageForm" and name:"Error"', timeout=1.0, raise_error=False)
             if not modal_error_ya_ordenado: #si no está ordenada la operación
-                time.sleep(0.1)
+                time.sleep(DEFAULT_TIMING['short_wait'])
                 boton_validar_op = ventana_proceso.find('class:"TBitBtn" and path:"1|1|1"')
-                boton_validar_op.click(wait_time=0.1)
+                boton_validar_op.click(wait_time=DEFAULT_TIMING['short_wait'])
                 boton_validar_orden = ventana_proceso.find('class:"TBitBtn" and path:"2|1|3|12" and name:"Validar"')
-                boton_validar_orden.click(wait_time=0.1)
-                boton_modal_info_ok = ventana_proceso.find('class:"TButton" and name:"OK" and path:"1|1"')
-                boton_modal_info_ok.click(wait_time=1.0)
+                boton_validar_orden.click(wait_time=DEFAULT_TIMING['short_wait'])
+                boton_modal_info_ok = ventana_proceso.find(COMMON_DIALOG_PATHS['info_ok_alt'])
+                boton_modal_info_ok.click(wait_time=DEFAULT_TIMING['long_wait'])
                 #imprimir mto de pago
                 check_mto_pago = ventana_proceso.find('class:"TCheckBox" and name:"Mandamientos de Pagos"')
-                check_mto_pago.click(wait_time=0.2)
+                check_mto_pago.click(wait_time=DEFAULT_TIMING['default_wait'])
                 btn_validad_mto_pago = ventana_proceso.find('class:"TBitBtn" and path:"1|1|9"')
-                btn_validad_mto_pago.click(wait_time=0.2)
+                btn_validad_mto_pago.click(wait_time=DEFAULT_TIMING['default_wait'])
 
-                #aparecen varios cuadros de dialogo que tendremos que confirmar
-                btn_modal_confirm_yes = ventana_proceso.find('class:"TButton" and name:"Yes" and path:"1|2"')
-                btn_modal_confirm_yes.click(wait_time=0.2)
+                #aparecen varios cuadros de dialogo que tendremos que confirmar (el último, firmantes)
+                confirm_repeated_dialogs(ventana_proceso, COMMON_DIALOG_PATHS['confirm_yes_alt'], 3, wait_time=DEFAULT_TIMING['default_wait'])
 
-                btn_modal_confirm_yes2 = ventana_proceso.find('class:"TButton" and name:"Yes" and path:"1|2"')
-                btn_modal_confirm_yes2.click(wait_time=0.2)
+                ventana_imprimir = windows.find_window(SICAL_WINDOWS['print_dialog'])
+                ventana_imprimir.find(COMMON_DIALOG_PATHS['print_accept']).click(wait_time=DEFAULT_TIMING['long_wait'])
 
-                btn_modal_confirm_firmantes = ventana_proceso.find('class:"TButton" and name:"Yes" and path:"1|2"')
-                btn_modal_confirm_firmantes.click(wait_time=0.2)
-
-                ventana_imprimir = windows.find_window('regex:.*Imprimir')
-                ventana_imprimir.find('class:"Button" and name:"Aceptar" and path:"26"').click(wait_time=1.0)
-
-                btn_final_ok = ventana_proceso.find('class:"TButton" and name:"OK" and path:"1|1"')
-                btn_final_ok.click(wait_time=0.5)
+                btn_final_ok = ventana_proceso.find(COMMON_DIALOG_PATHS['info_ok_alt'])
+                btn_final_ok.click(wait_time=DEFAULT_TIMING['medium_wait'])
             
             else:
-                ventana_proceso.find('class:"TButton" and name:"OK"').click(wait_time=0.8)
-                ventana_proceso.find('class:"TButton" and name:"OK"').click(wait_time=0.8)
-                ventana_proceso.find('class:"TBitBtn" and path:"1|1|2"').click(wait_time=0.8)
+                confirm_repeated_dialogs(ventana_proceso, COMMON_DIALOG_PATHS['ok_button'], 2, wait_time=DEFAULT_TIMING['dialog_wait'])
+                ventana_proceso.find('class:"TBitBtn" and path:"1|1|2"').click(wait_time=DEFAULT_TIMING['dialog_wait'])
             
 
             btn_pagar_mto_pago = ventana_proceso.find('class:"TBitBtn" and name:"Pagar" and path:"2|5"')
-            btn_pagar_mto_pago.click(wait_time=0.4)
+            btn_pagar_mto_pago.click(wait_time=DEFAULT_TIMING['pay_wait'])
 
             option_operation_el = ventana_proceso.find('name:"Nº Operación" and class:"TGroupButton"')
-            option_operation_el.click(wait_time=0.5)
+            option_operation_el.click(wait_time=DEFAULT_TIMING['medium_wait'])
 
-            num_operation_el = ventana_proceso.find('class:"TEdit" and path:"1|1|4"').click(wait_time=0.2)
-            num_operation_el.send_keys(datos_pago['num_operacion'], interval=0.1, wait_time=0.5, send_enter=True)
+            num_operation_el = ventana_proceso.find('class:"TEdit" and path:"1|1|4"').click(wait_time=DEFAULT_TIMING['default_wait'])
+            paste_text(num_operation_el, datos_pago['num_operacion'], wait_time=DEFAULT_TIMING['medium_wait'], send_enter=True)
 
             boton_validar_op = ventana_proceso.find('class:"TBitBtn" and path:"1|1|1"')
-            boton_validar_op.click(wait_time=1.0)
+            boton_validar_op.click(wait_time=DEFAULT_TIMING['long_wait'])
 
             boton_validar_orden = ventana_proceso.find('class:"TBitBtn" and path:"2|1|3|12" and name:"Validar"')
-            boton_validar_orden.click(wait_time=1.0)
+            boton_validar_orden.click(wait_time=DEFAULT_TIMING['long_wait'])
             
-            boton_modal_info_ok = ventana_proceso.find('class:"TButton" and name:"OK" and path:"1|1"')
-            boton_modal_info_ok.click(wait_time=1.0)
+            boton_modal_info_ok = ventana_proceso.find(COMMON_DIALOG_PATHS['info_ok_alt'])
+            boton_modal_info_ok.click(wait_time=DEFAULT_TIMING['long_wait'])
 
             btn_salir_impresion = ventana_proceso.find('class:"TBitBtn" and path:"1|1|10"')
             btn_salir_impresion.click()
-            time.sleep(0.5)
+            time.sleep(DEFAULT_TIMING['medium_wait'])
             btn_salir_tes_pagos = ventana_proceso.find('class:"TBitBtn" and name:"Salir" and path:"2|8"')
             btn_salir_tes_pagos.click()
         else:
@@ -278,7 +253,7 @@ def abrir_ventana_opcion_en_menu(menu_a_buscar):
                 'TRATAMIENTO INDIVIDUALIZADO/RESUMEN')
     rama_tesoreria_pagos = ('TESORERIA', 'GESTION DE PAGOS', 'PROCESO DE ORDENACION Y PAGO')
 
-    app = windows.find_window('regex:.*FMenuSical', raise_error=False)
+    app = windows.find_window(SICAL_WINDOWS['main_menu'], raise_error=False)
     if not app:
         print('¡¡¡¡¡¡¡¡¡¡¡¡¡¡¡', 'SICAL CLOSED?????')
         return False
@@ -296,7 +271,6 @@ def abrir_ventana_opcion_en_menu(menu_a_buscar):
     app.find(f'control:"TreeItemControl" and name:"{last_element}"').double_click()
     return True
 
-@task
 def retraer_todos_elementos_del_menu():
     '''Repliega todos los elementos del menu'''
     tree_elements = ['GASTOS', 'INGRESOS', 'OPERACIONES NO PRESUPUESTARIAS', 'TESORERIA',
@@ -305,7 +279,7 @@ def retraer_todos_elementos_del_menu():
                     'TRANSACCIONES ESPECIALES', 'CONSULTAS AVANZADAS', 'FACTURAS', 
                     'OFICINA DE PRESUPUESTO', 'INVENTARIO CONTABLE']
     
-    app = windows.find_window('regex:.*FMenuSical')
+    app = windows.find_window(SICAL_WINDOWS['main_menu'])
     for element in tree_elements:
         element = app.find(f'control:"TreeItemControl" and name:"{element}"',
                         search_depth=2, timeout=0.01)
@@ -315,9 +289,9 @@ def retraer_todos_elementos_del_menu():
 def handle_error_cleanup():
     """Clean up SICAL windows in case of error"""
     try:
-        modal_dialog = windows.find_window("regex:.*mtec40")
+        modal_dialog = windows.find_window(SICAL_WINDOWS['error_dialog'])
         if modal_dialog:
-            modal_dialog.find('class:"TButton" and name:"OK"').click()
+            modal_dialog.find(COMMON_DIALOG_PATHS['ok_button']).click()
         
         # Additional cleanup as needed
     except Exception as e:
@@ -16,6 +16,8 @@ from robocorp import windows
 from sical_base import (
     SicalOperationProcessor,
     SicalWindowManager,
+    ConsultaWindowManager,
+    TesoreriaPagosWindowManager,
     OperationResult,
     OperationStatus,
 )
@@ -42,8 +44,11 @@ from sical_utils import (
     extract_caja_code,
     check_finalize_flag,
     show_windows_message_box,
+    confirm_repeated_dialogs,
     find_element_with_fallback,
     handle_error_cleanup,
+    paste_text,
+    wait_for_window,
 )
 from sical_security import (
     get_confirmation_manager,
@@ -98,7 +103,7 @@ class PMP450Processor(SicalOperationProcessor):
         """
         # Extract texto field from texto_sical array
         texto_sical = operation_data.get('texto_sical', [])
-        if texto_sical and len(texto_sical) > 0:
+        if texto_sical:
             # PMP450 might use a different text field - adjust as needed
             texto_operacion = str(texto_sical[0].get('texto_ado', DEFAULT_OPERATION_VALUES['texto']))
         else:
@@ -109,6 +114,7 @@ class PMP450Processor(SicalOperationProcessor):
 
         # Convert fecha from DD/MM/YYYY to DDMMYYYY format
         fecha = transform_date_to_sical_format(operation_data.get('fecha', ''))
+        fecha_ordenamiento = operation_data.get('fecha_ordenamiento', fecha)
 
         # Extract caja code
         caja_raw = operation_data.get('caja', DEFAULT_OPERATION_VALUES['caja'])
@@ -129,8 +135,8 @@ class PMP450Processor(SicalOperationProcessor):
             'aux_data': operation_data.get('aux_data', {}),
             'metadata': operation_data.get('metadata', {}),
             # Keep original data for payment ordering
-            'fecha_ordenamiento': operation_data.get('fecha_ordenamiento', fecha),
-            'fecha_pago': operation_data.get('fecha_pago', operation_data.get('fecha_ordenamiento', fecha)),
+            'fecha_ordenamiento': fecha_ordenamiento,
+            'fecha_pago': operation_data.get('fecha_pago', fecha_ordenamiento),
             # Security: Duplicate handling policy and token
             'duplicate_policy': operation_data.get('duplicate_policy', 'abort_on_duplicate'),
             'duplicate_confirmation_token': operation_data.get('duplicate_confirmation_token'),
@@ -148,14 +154,15 @@ class PMP450Processor(SicalOperationProcessor):
             List of aplicaciones in SICAL-compatible format
         """
         aplicaciones = []
+        get_cuenta_pgp = PARTIDAS_GASTO_CUENTA_PGP.get
         for aplicacion in aplicaciones_data:
             economica = str(aplicacion['economica'])
 
             # Prefer cuenta_pgp from message, fallback to mapping table
-            if 'cuenta_pgp' in aplicacion and aplicacion['cuenta_pgp']:
-                cuenta = str(aplicacion['cuenta_pgp'])
+            if cuenta_pgp := aplicacion.get('cuenta_pgp'):
+                cuenta = str(cuenta_pgp)
             else:
-                cuenta = PARTIDAS_GASTO_CUENTA_PGP.get(economica, DEFAULT_CUENTA_PGP)
+                cuenta = get_cuenta_pgp(economica, DEFAULT_CUENTA_PGP)
 
             importe = str(aplicacion['importe'])
 
@@ -192,8 +199,12 @@ class PMP450Processor(SicalOperationProcessor):
                 self.logger.error(f'Unable to open PMP450 window via menu: {menu_path}')
                 return False
 
-        self.window_manager.ventana_proceso = self.window_manager.find_proceso_window()
-        self.logger.debug(f'PMP450 window: {self.window_manager.ventana_proceso}')
+        self.window_manager.ventana_proceso = wait_for_window(
+            self.window_manager.window_pattern,
+            timeout=DEFAULT_TIMING['window_open_timeout'],
+            retry_interval=DEFAULT_TIMING['short_wait']
+        )
+        self.logger.debug('PMP450 window: %s', self.window_manager.ventana_proceso)
         return bool(self.window_manager.ventana_proceso)
 
     def check_for_duplicates_pre_window(
@@ -302,9 +313,6 @@ class PMP450Processor(SicalOperationProcessor):
         self.logger.info('Checking for duplicate operations')
         self.notify_step('Checking for duplicate operations')
 
-        # Import ADO220 processor's consulta window manager
-        from .ado220_processor import ConsultaWindowManager
-
         consulta_manager = ConsultaWindowManager(self.logger)
         duplicate_policy = operation_data.get('duplicate_policy', 'abort_on_duplicate')
 
@@ -412,91 +420,6 @@ class PMP450Processor(SicalOperationProcessor):
 
         return result
 
-    def _setup_consulta_window(self, window_manager) -> bool:
-        """Setup the Consulta operations window."""
-        menu_path = SICAL_MENU_PATHS['consulta']
-
-        if not open_menu_option(menu_path, self.logger):
-            time.sleep(3)
-            if not open_menu_option(menu_path, self.logger):
-                self.logger.error(f'Unable to open Consulta window: {menu_path}')
-                return False
-
-        time.sleep(2)
-        window_manager.ventana_proceso = window_manager.find_proceso_window()
-        self.logger.debug(f'Consulta window: {window_manager.ventana_proceso}')
-        return bool(window_manager.ventana_proceso)
-
-    def _fill_duplicate_check_filters(
-        self,
-        filtros_window,
-        operation_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Fill the filter fields for duplicate checking.
-
-        Returns:
-            Dictionary with search criteria used
-        """
-        wait_time = DEFAULT_TIMING['short_wait']
-        interval = DEFAULT_TIMING['short_wait']
-
-        # Build search criteria dictionary
-        search_criteria = {
-            'tercero': operation_data['tercero'],
-            'fecha': operation_data['fecha'],
-            'caja': operation_data['caja']
-        }
-
-        # Tercero
-        tercero_field = filtros_window.find(FILTROS_FORM_PATHS['tercero'])
-        tercero_field.double_click()
-        tercero_field.send_keys(operation_data['tercero'], interval=interval, wait_time=wait_time, send_enter=True)
-
-        # Date range
-        fecha = operation_data['fecha']
-        from_date_field = filtros_window.find(FILTROS_FORM_PATHS['fecha_desde'])
-        from_date_field.double_click()
-        from_date_field.send_keys(fecha, interval=0.01, wait_time=wait_time, send_enter=True)
-
-        to_date_field = filtros_window.find(FILTROS_FORM_PATHS['fecha_hasta'])
-        to_date_field.double_click()
-        to_date_field.send_keys(fecha, interval=0.01, wait_time=wait_time, send_enter=True)
-
-        # Aplicacion
-        if operation_data.get('aplicaciones'):
-            first_app = operation_data['aplicaciones'][0]
-
-            search_criteria.update({
-                'funcional': first_app['funcional'],
-                'economica': first_app['economica'],
-                'importe_min': first_app['importe'],
-                'importe_max': first_app['importe']
-            })
-
-            funcional_field = filtros_window.find(FILTROS_FORM_PATHS['funcional'])
-            funcional_field.double_click()
-            funcional_field.send_keys(first_app['funcional'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-            economica_field = filtros_window.find(FILTROS_FORM_PATHS['economica'])
-            economica_field.double_click()
-            economica_field.send_keys(first_app['economica'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-            importe_desde = filtros_window.find(FILTROS_FORM_PATHS['importe_desde'])
-            importe_desde.double_click()
-            importe_desde.send_keys(first_app['importe'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-            importe_hasta = filtros_window.find(FILTROS_FORM_PATHS['importe_hasta'])
-            importe_hasta.double_click()
-            importe_hasta.send_keys(first_app['importe'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-        # Caja
-        caja_field = filtros_window.find(FILTROS_FORM_PATHS['caja'])
-        caja_field.click()
-        caja_field.send_keys(operation_data['caja'], interval=0.01, wait_time=wait_time, send_enter=True)
-
-        return search_criteria
-
     def _enter_operation_data(
         self,
         operation_data: Dict[str, Any],
@@ -576,12 +499,14 @@ class PMP450Processor(SicalOperationProcessor):
         ventana.find(PMP450_FORM_PATHS['tesoreria_check']).click(wait_time=wait_time)
 
         # Forma de pago
-        forma_pago = find_element_with_fallback(
-            ventana,
-            PMP450_FORM_PATHS['forma_pago_primary'],
-            PMP450_FORM_PATHS['forma_pago_alternate'],
-            raise_error=True
-        )
+        forma_pago = ventana.find(PMP450_FORM_PATHS['forma_pago_primary'], raise_error=False)
+        # The payment fields share one panel: once its path variant is known,
+        # try that variant first for tipo de pago and caja
+        if forma_pago:
+            first, second = 'primary', 'alternate'
+        else:
+            first, second = 'alternate', 'primary'
+            forma_pago = ventana.find(PMP450_FORM_PATHS['forma_pago_alternate'])
         forma_pago.double_click(wait_time=wait_time)
         forma_pago.send_keys(keys=operation_data['fpago'], interval=0.01, wait_time=wait_time)
         forma_pago.send_keys(keys='{Enter}', wait_time=wait_time)
@@ -589,8 +514,8 @@ class PMP450Processor(SicalOperationProcessor):
         # Tipo de pago
         tipo_pago = find_element_with_fallback(
             ventana,
-            PMP450_FORM_PATHS['tipo_pago_primary'],
-            PMP450_FORM_PATHS['tipo_pago_alternate'],
+            PMP450_FORM_PATHS[f'tipo_pago_{first}'],
+            PMP450_FORM_PATHS[f'tipo_pago_{second}'],
             raise_error=True
         )
         tipo_pago.double_click(wait_time=wait_time)
@@ -600,8 +525,8 @@ class PMP450Processor(SicalOperationProcessor):
         # Caja
         caja_element = find_element_with_fallback(
             ventana,
-            PMP450_FORM_PATHS['caja_primary'],
-            PMP450_FORM_PATHS['caja_alternate'],
+            PMP450_FORM_PATHS[f'caja_{first}'],
+            PMP450_FORM_PATHS[f'caja_{second}'],
             raise_error=True
         )
         caja_element.click(wait_time=wait_time)
@@ -610,7 +535,7 @@ class PMP450Processor(SicalOperationProcessor):
         # Texto
         texto_element = ventana.find(PMP450_FORM_PATHS['texto']).double_click()
         texto_element.send_keys(keys='{Ctrl}{A}', wait_time=wait_time)
-        texto_element.send_keys(operation_data['texto'], wait_time=DEFAULT_TIMING['default_wait'])
+        paste_text(texto_element, operation_data['texto'])
         texto_element.send_keys(keys='{Enter}', wait_time=wait_time)
 
     def _fill_aplicaciones(
@@ -624,10 +549,14 @@ class PMP450Processor(SicalOperationProcessor):
 
         ventana.find(PMP450_FORM_PATHS['aplicaciones_grid']).double_click()
 
+        # The line buttons stay in place while rows are added; look them up once
+        new_line_button = ventana.find(PMP450_FORM_PATHS['new_line_button'])
+        confirm_line_button = ventana.find(PMP450_FORM_PATHS['confirm_line_button'])
+
         suma_aplicaciones = 0.0
 
         for i, aplicacion in enumerate(aplicaciones):
-            self.logger.debug(f'Processing aplicacion {i + 1}: {aplicacion}')
+            self.logger.debug('Processing aplicacion %s: %s', i + 1, aplicacion)
             self.notify_step(
                 f'Processing line item {i + 1} of {len(aplicaciones)}',
                 current_line_item=i + 1,
@@ -635,7 +564,7 @@ class PMP450Processor(SicalOperationProcessor):
                 line_item_details=f"Func: {aplicacion['funcional']}, Econ: {aplicacion['economica']}, Amount: {aplicacion['importe']}"
             )
 
-            ventana.find(PMP450_FORM_PATHS['new_line_button']).click()
+            new_line_button.click()
 
             ventana.send_keys(keys='{Tab}', interval=0.05, wait_time=default_wait, send_enter=False)
             ventana.send_keys(keys=aplicacion['funcional'], interval=default_wait, wait_time=default_wait, send_enter=True)
@@ -650,7 +579,7 @@ class PMP450Processor(SicalOperationProcessor):
 
             ventana.send_keys(keys=aplicacion['cuenta'], interval=default_wait, wait_time=DEFAULT_TIMING['default_wait'])
 
-            ventana.find(PMP450_FORM_PATHS['confirm_line_button']).click()
+            confirm_line_button.click()
 
             try:
                 suma_aplicaciones += float(aplicacion['importe'].replace(',', '.'))
@@ -668,7 +597,7 @@ class PMP450Processor(SicalOperationProcessor):
         result.status = OperationStatus.PENDING
 
         try:
-            self.logger.info(f'Validating PMP450 operation in window: {ventana}')
+            self.logger.info('Validating PMP450 operation in window: %s', ventana)
             ventana.find(PMP450_FORM_PATHS['validar_button']).click(wait_time=DEFAULT_TIMING['default_wait'])
 
             modal_confirm = windows.find_window(SICAL_WINDOWS['confirm_dialog'])
@@ -729,7 +658,7 @@ class PMP450Processor(SicalOperationProcessor):
                 return result
 
             campo_id = ventana_consulta.find(CONSULTA_FORM_PATHS['id_operacion'])
-            campo_id.send_keys(num_operacion, interval=0.1, wait_time=DEFAULT_TIMING['default_wait'], send_enter=True)
+            paste_text(campo_id, num_operacion, wait_time=DEFAULT_TIMING['default_wait'], send_enter=True)
 
             ventana_consulta.find(CONSULTA_FORM_PATHS['imprimir_button']).click()
 
@@ -780,9 +709,6 @@ class PMP450Processor(SicalOperationProcessor):
         self.logger.info(f'Ordering payment for operation: {num_operacion}')
         self.notify_step('Opening payment window')
 
-        # Import from ADO220 processor to reuse payment logic
-        from .ado220_processor import TesoreriaPagosWindowManager
-
         pagos_manager = TesoreriaPagosWindowManager(self.logger)
 
         try:
@@ -791,13 +717,14 @@ class PMP450Processor(SicalOperationProcessor):
                 result.error = 'Failed to open Tesoreria Pagos window'
                 return result
 
+            fecha_ordenamiento = operation_data.get('fecha_ordenamiento', operation_data['fecha'])
             datos_pago = {
                 'num_operacion': num_operacion,
-                'fecha_ordenamiento': operation_data.get('fecha_ordenamiento', operation_data['fecha']),
-                'fecha_pago': operation_data.get('fecha_pago', operation_data.get('fecha_ordenamiento', operation_data['fecha']))
+                'fecha_ordenamiento': fecha_ordenamiento,
+                'fecha_pago': operation_data.get('fecha_pago', fecha_ordenamiento)
             }
 
-            self.logger.info(f'Payment data: {datos_pago}')
+            self.logger.info('Payment data: %s', datos_pago)
             result = self._execute_payment_ordering(pagos_manager.ventana_proceso, datos_pago, result)
 
         except Exception as e:
@@ -816,8 +743,12 @@ class PMP450Processor(SicalOperationProcessor):
         if not open_menu_option(menu_path, self.logger):
             return False
 
-        window_manager.ventana_proceso = window_manager.find_proceso_window()
-        self.logger.debug(f'Tesoreria window: {window_manager.ventana_proceso}')
+        window_manager.ventana_proceso = wait_for_window(
+            window_manager.window_pattern,
+            timeout=DEFAULT_TIMING['window_open_timeout'],
+            retry_interval=DEFAULT_TIMING['short_wait']
+        )
+        self.logger.debug('Tesoreria window: %s', window_manager.ventana_proceso)
         return bool(window_manager.ventana_proceso)
 
     def _execute_payment_ordering(
@@ -846,7 +777,7 @@ class PMP450Processor(SicalOperationProcessor):
             ventana.find(TESORERIA_PAGOS_PATHS['option_num_operacion']).click(wait_time=0.5)
 
             num_op_element = ventana.find(TESORERIA_PAGOS_PATHS['num_operacion_input']).click(wait_time=0.2)
-            num_op_element.send_keys(datos_pago['num_operacion'], interval=0.1, wait_time=0.5, send_enter=True)
+            paste_text(num_op_element, datos_pago['num_operacion'], wait_time=0.5, send_enter=True)
 
             modal_error = ventana.find('class:"TMessageForm" and name:"Error"', timeout=1.0, raise_error=False)
 
@@ -883,9 +814,7 @@ class PMP450Processor(SicalOperationProcessor):
         ventana.find(TESORERIA_PAGOS_PATHS['check_mto_pago']).click(wait_time=0.2)
         ventana.find(TESORERIA_PAGOS_PATHS['validar_mto_button']).click(wait_time=0.2)
 
-        ventana.find(COMMON_DIALOG_PATHS['confirm_yes_alt']).click(wait_time=0.2)
-        ventana.find(COMMON_DIALOG_PATHS['confirm_yes_alt']).click(wait_time=0.2)
-        ventana.find(COMMON_DIALOG_PATHS['confirm_yes_alt']).click(wait_time=0.2)
+        confirm_repeated_dialogs(ventana, COMMON_DIALOG_PATHS['confirm_yes_alt'], 3, wait_time=DEFAULT_TIMING['default_wait'])
 
         ventana_imprimir = windows.find_window(SICAL_WINDOWS['print_dialog'])
         ventana_imprimir.find(COMMON_DIALOG_PATHS['print_accept']).click(wait_time=1.0)
@@ -898,7 +827,7 @@ class PMP450Processor(SicalOperationProcessor):
         ventana.find(TESORERIA_PAGOS_PATHS['option_num_operacion']).click(wait_time=0.5)
 
         num_op_element = ventana.find(TESORERIA_PAGOS_PATHS['num_operacion_input']).click(wait_time=0.2)
-        num_op_element.send_keys(datos_pago['num_operacion'], interval=0.1, wait_time=0.5, send_enter=True)
+        paste_text(num_op_element, datos_pago['num_operacion'], wait_time=0.5, send_enter=True)
 
         ventana.find(TESORERIA_PAGOS_PATHS['validar_op_button']).click(wait_time=1.0)
         ventana.find(TESORERIA_PAGOS_PATHS['validar_orden_button']).click(wait_time=1.0)
@@ -11,13 +11,20 @@ import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 from typing import Any, Dict, Optional, Callable
 
 from robocorp import windows
 
-from sical_constants import SICAL_WINDOWS, DEFAULT_TIMING
+from sical_constants import (
+    SICAL_WINDOWS,
+    SICAL_MENU_PATHS,
+    FILTROS_FORM_PATHS,
+    DEFAULT_TIMING,
+)
 from sical_config import GUI_EVENTS
+from sical_utils import open_menu_option, paste_text, wait_for_window
 
 
 # =============================================================================
@@ -42,13 +49,14 @@ class OperationStatus(Enum):
 # DATA STRUCTURES - Common result and data classes
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class OperationResult:
     """
     Result object for SICAL operations.
 
     This dataclass contains all information about an operation's execution,
-    including status, timing, errors, and metadata.
+    including status, timing, errors, and metadata. It is slotted, so only
+    the declared fields can be set.
     """
     status: OperationStatus
     init_time: str
@@ -69,6 +77,34 @@ class OperationResult:
     duplicate_token_expires_at: Optional[float] = None
 
 
+def operation_result_to_dict(result: OperationResult) -> Dict[str, Any]:
+    """
+    Build a JSON-ready dict from an OperationResult.
+
+    Reads the fields directly instead of going through dataclasses.asdict,
+    which introspects the class and deep-copies nested values on every call.
+    Nested lists/dicts are shared with the result, so treat the dict as
+    read-only.
+    """
+    return {
+        'status': result.status.value,
+        'init_time': result.init_time,
+        'end_time': result.end_time,
+        'duration': result.duration,
+        'error': result.error,
+        'num_operacion': result.num_operacion,
+        'total_operacion': result.total_operacion,
+        'suma_aplicaciones': result.suma_aplicaciones,
+        'sical_is_open': result.sical_is_open,
+        'completed_phases': result.completed_phases,
+        'similiar_records_encountered': result.similiar_records_encountered,
+        'duplicate_details': result.duplicate_details,
+        'duplicate_check_metadata': result.duplicate_check_metadata,
+        'duplicate_confirmation_token': result.duplicate_confirmation_token,
+        'duplicate_token_expires_at': result.duplicate_token_expires_at,
+    }
+
+
 class OperationEncoder(json.JSONEncoder):
     """Custom JSON encoder for SICAL operation objects."""
 
@@ -76,26 +112,26 @@ class OperationEncoder(json.JSONEncoder):
         if isinstance(obj, OperationStatus):
             return obj.value
         if isinstance(obj, OperationResult):
-            return {
-                'status': obj.status.value,
-                'init_time': obj.init_time,
-                'end_time': obj.end_time,
-                'duration': obj.duration,
-                'error': obj.error,
-                'num_operacion': obj.num_operacion,
-                'total_operacion': obj.total_operacion,
-                'suma_aplicaciones': obj.suma_aplicaciones,
-                'sical_is_open': obj.sical_is_open,
-                'completed_phases': obj.completed_phases,
-                'similiar_records_encountered': obj.similiar_records_encountered,
-                'duplicate_details': obj.duplicate_details,
-                'duplicate_check_metadata': obj.duplicate_check_metadata,
-                'duplicate_confirmation_token': obj.duplicate_confirmation_token,
-                'duplicate_token_expires_at': obj.duplicate_token_expires_at,
-            }
+            return operation_result_to_dict(obj)
         return super().default(obj)
 
 
+def operation_json_default(obj: Any) -> Any:
+    """
+    Fallback hook for ``orjson.dumps(..., default=operation_json_default)``.
+
+    orjson serializes dataclasses, enums and datetimes natively; this covers
+    the remaining types that may appear in operation results.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
 # =============================================================================
 # WINDOW MANAGERS - Base class for SICAL window management
 # =============================================================================
@@ -166,6 +202,25 @@ class SicalWindowManager(ABC):
         return self.ventana_proceso is not None
 
 
+# Windows shared by several operation types. Each operation's own window
+# manager lives next to its processor.
+
+class ConsultaWindowManager(SicalWindowManager):
+    """Window manager for Consulta operation windows."""
+
+    @property
+    def window_pattern(self) -> str:
+        return SICAL_WINDOWS['consulta']
+
+
+class TesoreriaPagosWindowManager(SicalWindowManager):
+    """Window manager for Tesoreria Pagos windows."""
+
+    @property
+    def window_pattern(self) -> str:
+        return SICAL_WINDOWS['tesoreria']
+
+
 # =============================================================================
 # OPERATION PROCESSORS - Abstract base class for operation processing
 # =============================================================================
@@ -500,6 +555,96 @@ class SicalOperationProcessor(ABC):
         # Default implementation - override in subclasses
         return result
 
+    def _setup_consulta_window(self, window_manager: SicalWindowManager) -> bool:
+        """Setup the Consulta operations window."""
+        menu_path = SICAL_MENU_PATHS['consulta']
+
+        if not open_menu_option(menu_path, self.logger):
+            time.sleep(3)
+            if not open_menu_option(menu_path, self.logger):
+                self.logger.error(f'Unable to open Consulta window: {menu_path}')
+                return False
+
+        # Poll for the window instead of a fixed 2s sleep
+        window_manager.ventana_proceso = wait_for_window(
+            window_manager.window_pattern,
+            timeout=DEFAULT_TIMING['window_open_timeout'],
+            retry_interval=DEFAULT_TIMING['short_wait']
+        )
+        self.logger.debug('Consulta window: %s', window_manager.ventana_proceso)
+        return bool(window_manager.ventana_proceso)
+
+    def _fill_duplicate_check_filters(
+        self,
+        filtros_window,
+        operation_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Fill the filter fields for duplicate checking.
+
+        Returns:
+            Dictionary with search criteria used
+        """
+        wait_time = DEFAULT_TIMING['short_wait']
+
+        # Build search criteria dictionary
+        search_criteria = {
+            'tercero': operation_data['tercero'],
+            'fecha': operation_data['fecha'],
+            'caja': operation_data['caja']
+        }
+
+        # Tercero and the amounts are plain TEdit filters, so they are pasted;
+        # the masked date fields and the codes keep send_keys
+        tercero_field = filtros_window.find(FILTROS_FORM_PATHS['tercero'])
+        tercero_field.double_click()
+        paste_text(tercero_field, operation_data['tercero'], wait_time=wait_time, send_enter=True)
+
+        # Date range (same date for from and to)
+        fecha = operation_data['fecha']
+        from_date_field = filtros_window.find(FILTROS_FORM_PATHS['fecha_desde'])
+        from_date_field.double_click()
+        from_date_field.send_keys(fecha, interval=0.01, wait_time=wait_time, send_enter=True)
+
+        to_date_field = filtros_window.find(FILTROS_FORM_PATHS['fecha_hasta'])
+        to_date_field.double_click()
+        to_date_field.send_keys(fecha, interval=0.01, wait_time=wait_time, send_enter=True)
+
+        # Aplicacion (first one)
+        if operation_data.get('aplicaciones'):
+            first_app = operation_data['aplicaciones'][0]
+
+            search_criteria.update({
+                'funcional': first_app['funcional'],
+                'economica': first_app['economica'],
+                'importe_min': first_app['importe'],
+                'importe_max': first_app['importe']
+            })
+
+            funcional_field = filtros_window.find(FILTROS_FORM_PATHS['funcional'])
+            funcional_field.double_click()
+            funcional_field.send_keys(first_app['funcional'], interval=0.01, wait_time=wait_time, send_enter=True)
+
+            economica_field = filtros_window.find(FILTROS_FORM_PATHS['economica'])
+            economica_field.double_click()
+            economica_field.send_keys(first_app['economica'], interval=0.01, wait_time=wait_time, send_enter=True)
+
+            # Amount range
+            importe_desde = filtros_window.find(FILTROS_FORM_PATHS['importe_desde'])
+            importe_desde.double_click()
+            paste_text(importe_desde, first_app['importe'], wait_time=wait_time, send_enter=True)
+
+            importe_hasta = filtros_window.find(FILTROS_FORM_PATHS['importe_hasta'])
+            importe_hasta.double_click()
+            paste_text(importe_hasta, first_app['importe'], wait_time=wait_time, send_enter=True)
+
+        # Caja
+        caja_field = filtros_window.find(FILTROS_FORM_PATHS['caja'])
+        caja_field.click()
+        caja_field.send_keys(operation_data['caja'], interval=0.01, wait_time=wait_time, send_enter=True)
+
+        return search_criteria
+
 
 # =============================================================================
 # CALLBACK HELPERS - Helper functions for GUI communication
@@ -123,6 +123,26 @@ LOGGING_CONFIG = {
     'log_rotation_size': 10 * 1024 * 1024,  # 10MB
 }
 
+# =============================================================================
+# RABBITMQ CONSUMER SETTINGS
+# =============================================================================
+
+# Number of unacknowledged deliveries the broker may push to the consumer.
+# A small pipeline avoids the idle round-trip between ack and next delivery,
+# but operations are still processed one at a time against the SICAL desktop,
+# so keep it low to bound memory and stay clear of the broker's ack timeout.
+# Two keeps the next message ready while the current one is being processed;
+# deliveries waiting in an ack batch also count against this limit.
+RABBITMQ_PREFETCH = 2
+
+# Completed deliveries are acknowledged together with basic_ack(multiple=True)
+# once this many have accumulated, or after the flush interval (seconds)
+# elapses. A short interval keeps the window in which a finished operation
+# could be redelivered after a connection drop small. The consumer clamps the
+# batch size to RABBITMQ_PREFETCH - 1, since pending acks hold prefetch slots.
+RABBITMQ_ACK_BATCH_SIZE = 10
+RABBITMQ_ACK_FLUSH_INTERVAL = 0.5
+
 # =============================================================================
 # GUI CALLBACK EVENT NAMES
 # =============================================================================
@@ -217,10 +217,13 @@ COMMON_DIALOG_PATHS = {
 DEFAULT_TIMING = {
     'short_wait': 0.1,
     'default_wait': 0.2,
+    'pay_wait': 0.4,  # After the Pagar button in Tesoreria
     'medium_wait': 0.5,
+    'dialog_wait': 0.8,  # Dialogs raised by Ordenar/OK in Tesoreria
     'long_wait': 1.0,
     'extra_long_wait': 2.0,
     'force_create_wait': 3.0,  # Extra wait for force_create operations
+    'window_open_timeout': 3.0,  # Max wait for a window opened from the menu
     'key_interval': 0.05,
     'slow_key_interval': 0.1,
 }
@@ -229,15 +232,14 @@ DEFAULT_TIMING = {
 # DATA DIRECTORIES - File system paths
 # =============================================================================
 
-import os
 from pathlib import Path
 
-ROBOT_DIR = Path(__file__).parent.absolute()
+ROBOT_DIR = Path(__file__).resolve().parent
 DATA_FOLDER_NAME = 'data'
-DATA_DIR = os.path.join(ROBOT_DIR, DATA_FOLDER_NAME)
-PENDING_DIR = os.path.join(DATA_DIR, 'pending')
-PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
-FAILED_DIR = os.path.join(DATA_DIR, 'z_failed')
+DATA_DIR = ROBOT_DIR / DATA_FOLDER_NAME
+PENDING_DIR = DATA_DIR / 'pending'
+PROCESSED_DIR = DATA_DIR / 'processed'
+FAILED_DIR = DATA_DIR / 'z_failed'
 
 # =============================================================================
 # OPERATION STATUS MESSAGES - Standard messages for different operations
@@ -31,7 +31,7 @@ def open_menu_option(menu_path: Tuple[str, ...], operation_logger: logging.Logge
     Returns:
         bool: True if menu option was opened successfully, False otherwise
     """
-    operation_logger.debug(f'Opening menu path: {menu_path}')
+    operation_logger.debug('Opening menu path: %s', menu_path)
 
     app = windows.find_window(SICAL_WINDOWS['main_menu'], raise_error=False)
     if not app:
@@ -48,7 +48,7 @@ def open_menu_option(menu_path: Tuple[str, ...], operation_logger: logging.Logge
             try:
                 # Re-find the main window on each attempt to get fresh handles
                 if attempt > 0:
-                    operation_logger.debug(f'Retry {attempt} for menu item "{element_name}"')
+                    operation_logger.debug('Retry %s for menu item "%s"', attempt, element_name)
                     time.sleep(DEFAULT_TIMING['medium_wait'])
                     app = windows.find_window(SICAL_WINDOWS['main_menu'], raise_error=False)
                     if not app:
@@ -95,7 +95,7 @@ def open_menu_option(menu_path: Tuple[str, ...], operation_logger: logging.Logge
         try:
             # Re-find the main window for final step
             if attempt > 0:
-                operation_logger.debug(f'Retry {attempt} for final menu option')
+                operation_logger.debug('Retry %s for final menu option', attempt)
                 time.sleep(DEFAULT_TIMING['medium_wait'])
                 app = windows.find_window(SICAL_WINDOWS['main_menu'], raise_error=False)
                 if not app:
@@ -104,7 +104,7 @@ def open_menu_option(menu_path: Tuple[str, ...], operation_logger: logging.Logge
 
             last_element_name = menu_path[-1]
             app.find(f'control:"TreeItemControl" and name:"{last_element_name}"').double_click()
-            operation_logger.debug(f'Opened menu option: {last_element_name}')
+            operation_logger.debug('Opened menu option: %s', last_element_name)
             return True
         except AttributeError as e:
             # Handle the specific __handle error
@@ -148,16 +148,16 @@ def collapse_all_menu_items(operation_logger: logging.Logger) -> None:
         app = windows.find_window(SICAL_WINDOWS['main_menu'])
         operation_logger.debug('Collapsing menu tree elements')
 
-        for element_name in MENU_TREE_ELEMENTS_TO_COLLAPSE:
+        # A single tree search for the top-level items instead of one per name
+        tree_items = app.find_many('control:"TreeItemControl"', search_depth=2)
+
+        for element in tree_items:
+            if element.name not in MENU_TREE_ELEMENTS_TO_COLLAPSE:
+                continue
             try:
-                element = app.find(
-                    f'control:"TreeItemControl" and name:"{element_name}"',
-                    search_depth=2,
-                    timeout=DEFAULT_TIMING['short_wait']
-                )
                 element.send_keys(keys='{SUBTRACT}', wait_time=DEFAULT_TIMING['short_wait'])
             except Exception:
-                # Element might not be found or already collapsed, continue
+                # Element might be gone or already collapsed, continue
                 pass
     except Exception as e:
         operation_logger.warning(f'Error collapsing menu items: {e}')
@@ -246,6 +246,90 @@ def show_windows_message_box(txt_message: str, txt_title: str) -> None:
     MessageBox(None, txt_message, txt_title, MB_SYSTEMMODAL | MB_ICONINFORMATION)
 
 
+# Clipboard API, on private DLL handles so these prototypes do not change the
+# shared ctypes.windll functions used by other code in the process
+_CF_UNICODETEXT = 13
+_GMEM_MOVEABLE = 0x0002
+# OpenClipboard fails while another process briefly holds the clipboard
+_CLIPBOARD_OPEN_ATTEMPTS = 5
+_CLIPBOARD_RETRY_DELAY = 0.05
+
+if hasattr(ctypes, 'WinDLL'):
+    _user32 = ctypes.WinDLL('user32')
+    _kernel32 = ctypes.WinDLL('kernel32')
+    # Handles are pointer-sized; the ctypes int default would truncate them on 64-bit
+    _kernel32.GlobalAlloc.argtypes = (ctypes.c_uint, ctypes.c_size_t)
+    _kernel32.GlobalAlloc.restype = ctypes.c_void_p
+    _kernel32.GlobalLock.argtypes = (ctypes.c_void_p,)
+    _kernel32.GlobalLock.restype = ctypes.c_void_p
+    _kernel32.GlobalUnlock.argtypes = (ctypes.c_void_p,)
+    _kernel32.GlobalFree.argtypes = (ctypes.c_void_p,)
+    _kernel32.GlobalFree.restype = ctypes.c_void_p
+    _user32.OpenClipboard.argtypes = (ctypes.c_void_p,)
+    _user32.SetClipboardData.argtypes = (ctypes.c_uint, ctypes.c_void_p)
+    _user32.SetClipboardData.restype = ctypes.c_void_p
+
+
+def _open_clipboard() -> None:
+    """Open the clipboard, retrying while another process holds it."""
+    for attempt in range(_CLIPBOARD_OPEN_ATTEMPTS):
+        if _user32.OpenClipboard(None):
+            return
+        if attempt < _CLIPBOARD_OPEN_ATTEMPTS - 1:
+            time.sleep(_CLIPBOARD_RETRY_DELAY)
+    raise OSError('Unable to open the clipboard')
+
+
+def set_clipboard_text(text: Any) -> None:
+    """
+    Replace the Windows clipboard contents with the given text.
+
+    Args:
+        text: Text to place on the clipboard; other values (such as numbers
+            decoded from JSON) are converted with str()
+    """
+    # create_unicode_buffer(int) would allocate an empty buffer of that length
+    buffer = ctypes.create_unicode_buffer(str(text))
+    size = ctypes.sizeof(buffer)
+
+    _open_clipboard()
+    try:
+        _user32.EmptyClipboard()
+        handle = _kernel32.GlobalAlloc(_GMEM_MOVEABLE, size)
+        if not handle:
+            raise MemoryError('Unable to allocate clipboard memory')
+        ctypes.memmove(_kernel32.GlobalLock(handle), buffer, size)
+        _kernel32.GlobalUnlock(handle)
+        if not _user32.SetClipboardData(_CF_UNICODETEXT, handle):
+            # The clipboard only takes ownership of the memory on success
+            _kernel32.GlobalFree(handle)
+            raise OSError('Unable to set clipboard data')
+    finally:
+        _user32.CloseClipboard()
+
+
+def paste_text(
+    element: Any,
+    text: Any,
+    wait_time: float = DEFAULT_TIMING['default_wait'],
+    send_enter: bool = False
+) -> None:
+    """
+    Enter text into a field by pasting it from the clipboard.
+
+    Much faster than typing long texts key by key, and characters with a
+    meaning in send_keys syntax (such as braces) are entered literally.
+
+    Args:
+        element: Field with the focus
+        text: Text to enter (non-str values are converted with str())
+        wait_time: Time to wait after pasting
+        send_enter: Whether to press Enter after pasting
+    """
+    set_clipboard_text(text)
+    element.send_keys(keys='{Ctrl}{V}', wait_time=wait_time, send_enter=send_enter)
+
+
 def wait_for_window(
     window_pattern: str,
     timeout: float = 5.0,
@@ -262,8 +346,8 @@ def wait_for_window(
     Returns:
         Window object if found, None otherwise
     """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    start_time = time.monotonic()
+    while time.monotonic() - start_time < timeout:
         window = windows.find_window(window_pattern, raise_error=False)
         if window:
             return window
@@ -337,6 +421,28 @@ def send_keys_with_validation(
         return False
 
 
+def confirm_repeated_dialogs(
+    window: Any,
+    button_path: str,
+    count: int,
+    wait_time: float = DEFAULT_TIMING['default_wait']
+) -> None:
+    """
+    Confirm a sequence of dialogs that share the same button path.
+
+    The button is looked up again for every dialog: each one is a new
+    window, so an element found for the previous dialog cannot be reused.
+
+    Args:
+        window: Window that owns the dialogs
+        button_path: Path to the confirmation button
+        count: Number of dialogs SICAL shows
+        wait_time: Time to wait after each click
+    """
+    for _ in range(count):
+        window.find(button_path).click(wait_time=wait_time)
+
+
 def find_element_with_fallback(
     window: Any,
     primary_path: str,
@@ -421,6 +527,4 @@ def clean_boolean_value(value: Any) -> bool:
         return value
     elif isinstance(value, str):
         return value.lower() == 'true'
-    elif isinstance(value, int):
-        return bool(value)
     return bool(value)
@@ -14,10 +14,14 @@ from collections import deque
 from typing import Optional, Dict, Any
 
 
+# Log lines kept in memory; older lines are evicted as new ones arrive
+MAX_RECENT_LOGS = 500
+
+
 class StatusManager:
     """Thread-safe status manager for the Gastos Robot GUI."""
 
-    def __init__(self, max_logs=500):
+    def __init__(self, max_logs=MAX_RECENT_LOGS):
         """Initialize the status manager."""
         self.lock = threading.Lock()
 
@@ -40,12 +44,17 @@ class StatusManager:
         # Last completed task (for displaying token info after completion)
         self.last_completed_task: Optional[Dict[str, Any]] = None
 
-        # Logs (using deque for efficient append/pop)
+        # Logs as (entry, level, message) tuples (using deque for efficient append/pop)
         self.logs = deque(maxlen=max_logs)
+        # Bumped on every new log so readers can skip unchanged log views
+        self.log_version = 0
+        # Bumped on every service, statistics or task change, for the same reason
+        self.state_version = 0
 
     def update_service_status(self, running: bool):
         """Update service running status."""
         with self.lock:
+            self.state_version += 1
             self.service_running = running
             if running:
                 self.start_time = time.time()
@@ -55,11 +64,13 @@ class StatusManager:
     def update_rabbitmq_status(self, connected: bool):
         """Update RabbitMQ connection status."""
         with self.lock:
+            self.state_version += 1
             self.rabbitmq_connected = connected
 
     def task_received(self, task_id: str):
         """Mark a task as received (pending)."""
         with self.lock:
+            self.state_version += 1
             self.stats['pending'] += 1
         self.add_log(f"Task received: {task_id[:16]}...", "INFO")
 
@@ -67,6 +78,7 @@ class StatusManager:
                     operation_number: str = None, amount: float = None, **kwargs):
         """Mark a task as started (processing)."""
         with self.lock:
+            self.state_version += 1
             self.stats['pending'] = max(0, self.stats['pending'] - 1)
             self.stats['processing'] += 1
 
@@ -114,6 +126,7 @@ class StatusManager:
     def task_progress(self, step: str, **kwargs):
         """Update current task progress with detailed info."""
         with self.lock:
+            self.state_version += 1
             if self.current_task:
                 self.current_task['current_step'] = step
 
@@ -139,12 +152,14 @@ class StatusManager:
             status: Token status ('received', 'validated', 'processing', 'finalized')
         """
         with self.lock:
+            self.state_version += 1
             if self.current_task:
                 self.current_task['token_status'] = status
 
     def task_completed(self, task_id: str, success: bool = True):
         """Mark a task as completed or failed."""
         with self.lock:
+            self.state_version += 1
             self.stats['processing'] = max(0, self.stats['processing'] - 1)
 
             if success:
@@ -172,6 +187,7 @@ class StatusManager:
     def reset_stats(self):
         """Reset all statistics."""
         with self.lock:
+            self.state_version += 1
             self.stats = {
                 'pending': 0,
                 'processing': 0,
@@ -187,7 +203,8 @@ class StatusManager:
         log_entry = f"[{timestamp}] [{level}] {message}"
 
         with self.lock:
-            self.logs.append(log_entry)
+            self.logs.append((log_entry, level, message))
+            self.log_version += 1
 
     def get_status(self) -> Dict[str, Any]:
         """
@@ -221,7 +238,10 @@ class StatusManager:
                 'success_rate': success_rate,
                 'current_task': current_task_copy,
                 'last_completed_task': self.last_completed_task.copy() if self.last_completed_task else None,
-                'recent_logs': list(self.logs)
+                'recent_logs': [entry for entry, _, _ in self.logs],
+                'recent_logs_typed': list(self.logs),
+                'log_version': self.log_version,
+                'state_version': self.state_version
             }
 
 
@@ -8,6 +8,7 @@ Supports search, filtering, statistics, and export functionality.
 import sqlite3
 import json
 import csv
+import textwrap
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -59,11 +60,18 @@ class TaskHistoryDB:
                 CREATE INDEX IF NOT EXISTS idx_operation_number ON task_history(operation_number)
             """)
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status ON task_history(status)
+                CREATE INDEX IF NOT EXISTS idx_created_at ON task_history(created_at)
             """)
+            # Status filter + most-recent-first listing in get_all_tasks; it
+            # also covers plain status lookups, so the old idx_status goes
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_created_at ON task_history(created_at)
+                CREATE INDEX IF NOT EXISTS idx_status_created_at ON task_history(status, created_at)
             """)
+            cursor.execute("DROP INDEX IF EXISTS idx_status")
+
+            # WAL lets the GUI read history while a finished task is being
+            # written; the setting is stored in the database file
+            cursor.execute("PRAGMA journal_mode=WAL")
 
             conn.commit()
             conn.close()
@@ -115,36 +123,45 @@ class TaskHistoryDB:
             print(f"Error adding task to history: {e}")
             return False
 
-    def get_all_tasks(self, limit: int = 100, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_page(self, limit: int = 100, offset: int = 0, search_term: Optional[str] = None,
+                 status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Get all tasks from history, most recent first.
+        Get one page of tasks, most recent first.
 
         Args:
-            limit: Maximum number of tasks to return
+            limit: Maximum number of tasks in the page
+            offset: Number of matching tasks to skip (the paging cursor)
+            search_term: Optional search in task_id, operation_number or third_party
             status_filter: Optional status filter ('completed', 'failed', etc.)
 
         Returns:
             List of task dictionaries
         """
+        conditions = []
+        params: List[Any] = []
+        if search_term:
+            search_pattern = f"%{search_term}%"
+            conditions.append("(task_id LIKE ? OR operation_number LIKE ? OR third_party LIKE ?)")
+            params.extend((search_pattern, search_pattern, search_pattern))
+        if status_filter:
+            conditions.append("status = ?")
+            params.append(status_filter)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.extend((limit, offset))
+
         try:
             with self.lock:
                 conn = sqlite3.connect(self.db_path)
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
 
-                if status_filter:
-                    cursor.execute("""
-                        SELECT * FROM task_history
-                        WHERE status = ?
-                        ORDER BY created_at DESC
-                        LIMIT ?
-                    """, (status_filter, limit))
-                else:
-                    cursor.execute("""
-                        SELECT * FROM task_history
-                        ORDER BY created_at DESC
-                        LIMIT ?
-                    """, (limit,))
+                # id breaks created_at ties so pages never overlap or skip rows
+                cursor.execute(f"""
+                    SELECT * FROM task_history
+                    {where_clause}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ? OFFSET ?
+                """, params)
 
                 rows = cursor.fetchall()
                 tasks = [dict(row) for row in rows]
@@ -153,45 +170,36 @@ class TaskHistoryDB:
                 return tasks
 
         except Exception as e:
-            print(f"Error getting tasks: {e}")
+            print(f"Error getting tasks page: {e}")
             return []
 
-    def search_tasks(self, search_term: str, limit: int = 100) -> List[Dict[str, Any]]:
+    def get_all_tasks(self, limit: int = 100, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get all tasks from history, most recent first.
+
+        Args:
+            limit: Maximum number of tasks to return
+            status_filter: Optional status filter ('completed', 'failed', etc.)
+
+        Returns:
+            List of task dictionaries
+        """
+        return self.get_page(limit=limit, status_filter=status_filter)
+
+    def search_tasks(self, search_term: str, limit: int = 100,
+                     status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search tasks by task_id, operation_number, or third_party.
 
         Args:
             search_term: Search string
             limit: Maximum number of results
+            status_filter: Optional status filter ('completed', 'failed', etc.)
 
         Returns:
             List of matching task dictionaries
         """
-        try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                search_pattern = f"%{search_term}%"
-                cursor.execute("""
-                    SELECT * FROM task_history
-                    WHERE task_id LIKE ?
-                       OR operation_number LIKE ?
-                       OR third_party LIKE ?
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                """, (search_pattern, search_pattern, search_pattern, limit))
-
-                rows = cursor.fetchall()
-                tasks = [dict(row) for row in rows]
-
-                conn.close()
-                return tasks
-
-        except Exception as e:
-            print(f"Error searching tasks: {e}")
-            return []
+        return self.get_page(limit=limit, search_term=search_term, status_filter=status_filter)
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -205,21 +213,16 @@ class TaskHistoryDB:
                 conn = sqlite3.connect(self.db_path)
                 cursor = conn.cursor()
 
-                # Total tasks
-                cursor.execute("SELECT COUNT(*) FROM task_history")
-                total_tasks = cursor.fetchone()[0]
-
-                # Completed tasks
-                cursor.execute("SELECT COUNT(*) FROM task_history WHERE status = 'completed'")
-                completed = cursor.fetchone()[0]
-
-                # Failed tasks
-                cursor.execute("SELECT COUNT(*) FROM task_history WHERE status IN ('failed', 'error')")
-                failed = cursor.fetchone()[0]
-
-                # Average duration
-                cursor.execute("SELECT AVG(duration_seconds) FROM task_history WHERE duration_seconds IS NOT NULL")
-                avg_duration = cursor.fetchone()[0] or 0
+                # All counters in a single pass over the table
+                cursor.execute("""
+                    SELECT COUNT(*),
+                           COALESCE(SUM(status = 'completed'), 0),
+                           COALESCE(SUM(status IN ('failed', 'error')), 0),
+                           AVG(duration_seconds)
+                    FROM task_history
+                """)
+                total_tasks, completed, failed, avg_duration = cursor.fetchone()
+                avg_duration = avg_duration or 0
 
                 conn.close()
 
@@ -239,13 +242,39 @@ class TaskHistoryDB:
                 'avg_duration': 0
             }
 
+    def _open_export_cursor(self, conn: sqlite3.Connection, limit: int) -> sqlite3.Cursor:
+        """
+        Open a cursor over the most recent tasks, for streaming exports.
+
+        The history database runs in WAL mode, so this read needs no lock and
+        does not block add_task while the export file is written.
+        """
+        return conn.execute("""
+            SELECT * FROM task_history
+            ORDER BY created_at DESC
+            LIMIT ?
+        """, (limit,))
+
     def export_to_json(self, filepath: str, limit: int = 1000) -> bool:
-        """Export task history to JSON file."""
+        """Export task history to JSON file, writing one task at a time."""
         try:
-            tasks = self.get_all_tasks(limit=limit)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(tasks, f, indent=2, ensure_ascii=False)
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            try:
+                cursor = self._open_export_cursor(conn, limit)
+
+                # Same layout as json.dump(tasks, indent=2)
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    f.write("[")
+                    has_rows = False
+                    for row in cursor:
+                        f.write(",\n" if has_rows else "\n")
+                        task_json = json.dumps(dict(row), indent=2, ensure_ascii=False)
+                        f.write(textwrap.indent(task_json, "  "))
+                        has_rows = True
+                    f.write("\n]" if has_rows else "]")
+            finally:
+                conn.close()
 
             return True
 
@@ -254,17 +283,23 @@ class TaskHistoryDB:
             return False
 
     def export_to_csv(self, filepath: str, limit: int = 1000) -> bool:
-        """Export task history to CSV file."""
+        """Export task history to CSV file, writing one task at a time."""
         try:
-            tasks = self.get_all_tasks(limit=limit)
-
-            if not tasks:
-                return False
-
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=tasks[0].keys())
-                writer.writeheader()
-                writer.writerows(tasks)
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = self._open_export_cursor(conn, limit)
+                first_row = cursor.fetchone()
+
+                if first_row is None:
+                    return False
+
+                with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow([column[0] for column in cursor.description])
+                    writer.writerow(first_row)
+                    writer.writerows(cursor)
+            finally:
+                conn.close()
 
             return True
 
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Tests for the GastoConsumer ack/confirm bookkeeping and message parsing.
+
+The consumer is built without a broker connection; a fake channel and IO
+loop record the acks it sends.
+"""
+
+import pytest
+
+pika = pytest.importorskip('pika')
+pytest.importorskip('comtypes')
+pytest.importorskip('config')
+
+from gasto_task_consumer import GastoConsumer, _sum_importes
+from sical_config import RABBITMQ_ACK_BATCH_SIZE
+
+
+class FakeIOLoop:
+    """Records scheduled timers instead of running them."""
+
+    def __init__(self):
+        self.timers = []
+
+    def call_later(self, delay, callback):
+        timer = (delay, callback)
+        self.timers.append(timer)
+        return timer
+
+    def remove_timeout(self, timer):
+        self.timers.remove(timer)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.ioloop = FakeIOLoop()
+
+
+class FakeChannel:
+    """Records basic_ack/basic_nack calls."""
+
+    is_open = True
+
+    def __init__(self):
+        self.acks = []
+        self.nacks = []
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acks.append((delivery_tag, multiple))
+
+    def basic_nack(self, delivery_tag, requeue=True):
+        self.nacks.append((delivery_tag, requeue))
+
+
+class FakeFrame:
+    def __init__(self, method):
+        self.method = method
+
+
+def confirm_frame(delivery_tag, multiple=False, ack=True):
+    method = pika.spec.Basic.Ack() if ack else pika.spec.Basic.Nack()
+    method.delivery_tag = delivery_tag
+    method.multiple = multiple
+    return FakeFrame(method)
+
+
+@pytest.fixture
+def consumer(monkeypatch):
+    """A consumer wired to a fake channel, with no ack batching limit from prefetch."""
+    monkeypatch.setattr(GastoConsumer, 'setup_connection', lambda self: None)
+    consumer = GastoConsumer(prefetch_count=0)
+    consumer.connection = FakeConnection()
+    consumer.channel = FakeChannel()
+    return consumer
+
+
+# ---------------------------------------------------------------------------
+# Batched acks
+# ---------------------------------------------------------------------------
+
+def test_ack_batch_size_clamped_to_prefetch(monkeypatch):
+    monkeypatch.setattr(GastoConsumer, 'setup_connection', lambda self: None)
+    assert GastoConsumer(prefetch_count=2)._ack_batch_size == 1
+    assert GastoConsumer(prefetch_count=1)._ack_batch_size == 1
+    assert GastoConsumer(prefetch_count=0)._ack_batch_size == RABBITMQ_ACK_BATCH_SIZE
+
+
+def test_queue_ack_schedules_single_flush(consumer):
+    consumer._queue_ack(1)
+    consumer._queue_ack(2)
+
+    assert consumer.channel.acks == []
+    assert len(consumer.connection.ioloop.timers) == 1
+    assert consumer._pending_ack_tag == 2
+    assert consumer._pending_ack_count == 2
+
+
+def test_flush_acks_sends_one_multiple_ack(consumer):
+    consumer._queue_ack(1)
+    consumer._queue_ack(2)
+    consumer._flush_acks()
+
+    assert consumer.channel.acks == [(2, True)]
+    assert consumer.connection.ioloop.timers == []
+    assert consumer._pending_ack_tag is None
+    assert consumer._pending_ack_count == 0
+
+    # Nothing pending: a second flush sends nothing
+    consumer._flush_acks()
+    assert consumer.channel.acks == [(2, True)]
+
+
+def test_queue_ack_flushes_full_batch(consumer):
+    for tag in range(1, RABBITMQ_ACK_BATCH_SIZE + 1):
+        consumer._queue_ack(tag)
+
+    assert consumer.channel.acks == [(RABBITMQ_ACK_BATCH_SIZE, True)]
+    assert consumer.connection.ioloop.timers == []
+
+
+def test_flush_acks_skips_closed_channel(consumer):
+    consumer._queue_ack(1)
+    consumer.channel.is_open = False
+    consumer._flush_acks()
+
+    assert consumer.channel.acks == []
+    assert consumer._pending_ack_tag is None
+
+
+# ---------------------------------------------------------------------------
+# Publisher confirms
+# ---------------------------------------------------------------------------
+
+def test_confirm_single_reply_queues_ack(consumer):
+    consumer._unconfirmed = {1: 10}
+    consumer._on_delivery_confirmation(confirm_frame(1))
+    consumer._flush_acks()
+
+    assert consumer._unconfirmed == {}
+    assert consumer.channel.acks == [(10, True)]
+
+
+def test_confirm_multiple_settles_all_older_replies(consumer):
+    consumer._unconfirmed = {1: 10, 2: 11, 3: 12}
+    consumer._on_delivery_confirmation(confirm_frame(2, multiple=True))
+
+    assert consumer._unconfirmed == {3: 12}
+
+    consumer._flush_acks()
+    assert consumer.channel.acks == [(11, True)]
+
+
+def test_out_of_order_confirm_acks_individually(consumer):
+    consumer._unconfirmed = {1: 10, 2: 11}
+
+    # Seq 2 confirmed while seq 1 is pending: a multiple=True ack of tag 11
+    # would also ack tag 10, so it must be acked on its own
+    consumer._on_delivery_confirmation(confirm_frame(2))
+    assert consumer.channel.acks == [(11, False)]
+    assert consumer._pending_ack_tag is None
+
+    consumer._on_delivery_confirmation(confirm_frame(1))
+    consumer._flush_acks()
+    assert consumer.channel.acks == [(11, False), (10, True)]
+    assert consumer._unconfirmed == {}
+
+
+def test_nacked_reply_still_acks_source(consumer):
+    consumer._unconfirmed = {1: 10}
+    consumer._on_delivery_confirmation(confirm_frame(1, ack=False))
+    consumer._flush_acks()
+
+    assert consumer.channel.acks == [(10, True)]
+    assert consumer.channel.nacks == []
+
+
+def test_unknown_confirm_is_ignored(consumer):
+    consumer._unconfirmed = {1: 10}
+    consumer._on_delivery_confirmation(confirm_frame(5))
+
+    assert consumer._unconfirmed == {1: 10}
+    assert consumer._pending_ack_tag is None
+
+
+# ---------------------------------------------------------------------------
+# Message parsing
+# ---------------------------------------------------------------------------
+
+def test_extract_wrapped_format(consumer):
+    data = {
+        'operation_data': {
+            'operation': {'tipo': 'ado220', 'detalle': {'fecha': '2024-01-01'}},
+            'duplicate_policy': 'abort',
+        }
+    }
+
+    operation_type, operation_data = consumer._extract_operation_data(data)
+
+    assert operation_type == 'ado220'
+    assert operation_data == {'fecha': '2024-01-01', 'duplicate_policy': 'abort'}
+
+
+def test_extract_wrapped_keeps_detalle_policy(consumer):
+    data = {
+        'operation_data': {
+            'operation': {'tipo': 'ado220', 'detalle': {'duplicate_policy': 'confirm'}},
+            'duplicate_policy': 'abort',
+        }
+    }
+
+    _, operation_data = consumer._extract_operation_data(data)
+
+    assert operation_data['duplicate_policy'] == 'confirm'
+
+
+def test_extract_direct_format_and_switch_back(consumer):
+    assert consumer._extract_operation_data({'tipo': 'pmp450', 'detalle': None}) == ('pmp450', {})
+    assert consumer._preferred_extractor == consumer._extract_direct
+
+    wrapped = {'operation_data': {'operation': {'tipo': 'ado220', 'detalle': {}}}}
+    assert consumer._extract_operation_data(wrapped) == ('ado220', {})
+    assert consumer._preferred_extractor == consumer._extract_wrapped
+
+
+def test_extract_invalid_format(consumer):
+    with pytest.raises(ValueError):
+        consumer._extract_operation_data({'foo': 'bar'})
+
+
+def test_sum_importes():
+    assert _sum_importes([{'importe': 10}, {'importe': 2.5}]) == 12.5
+    assert _sum_importes([{'importe': None}, {}, {'importe': 1}]) == 1
+    assert _sum_importes([{'importe': '10.5'}, {'importe': 2}]) == 12.5
+    assert _sum_importes([{'importe': 0.1}] * 10) == 1.0
+
+
+def test_sum_importes_rejects_non_numeric():
+    with pytest.raises(ValueError):
+        _sum_importes([{'importe': 'abc'}])
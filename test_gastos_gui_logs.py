@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental log view updates in GastosGUI.
+
+A fake Text widget stands in for Tk, so no display is needed.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip('tkinter')
+
+from gastos_gui import GastosGUI
+
+
+class FakeText:
+    """Minimal Text widget: whole-line 'N.0' indices and tagged inserts."""
+
+    def __init__(self, lines=None):
+        self.lines = list(lines or [])
+        self.calls = []
+
+    @staticmethod
+    def _line(index):
+        return int(index.split('.')[0]) - 1
+
+    def delete(self, start, end):
+        self.calls.append(('delete', start, end))
+        del self.lines[self._line(start):self._line(end)]
+
+    def insert(self, index, *chunks):
+        self.calls.append(('insert', index) + chunks)
+        new_lines = []
+        for text, tag in zip(chunks[::2], chunks[1::2]):
+            assert text.endswith('\n')
+            new_lines.extend((line, tag) for line in text.split('\n')[:-1])
+        position = self._line(index)
+        self.lines[position:position] = new_lines
+
+
+def test_tagged_runs_groups_consecutive_tags():
+    lines = [('a', 'INFO'), ('b', 'INFO'), ('c', 'ERROR'), ('d', 'INFO')]
+
+    assert GastosGUI._tagged_runs(lines) == [
+        'a\nb\n', 'INFO',
+        'c\n', 'ERROR',
+        'd\n', 'INFO',
+    ]
+
+
+def test_tagged_runs_empty():
+    assert GastosGUI._tagged_runs([]) == []
+
+
+def test_sync_unchanged_logs_touches_nothing():
+    logs = [('a', 'INFO'), ('b', 'ERROR')]
+    widget = FakeText(logs)
+
+    GastosGUI._sync_log_lines(widget, logs, list(logs))
+
+    assert widget.calls == []
+
+
+def test_sync_appended_logs_only_inserts_new_lines():
+    old = [('a', 'INFO'), ('b', 'INFO')]
+    new = old + [('c', 'INFO'), ('d', 'WARNING')]
+    widget = FakeText(old)
+
+    GastosGUI._sync_log_lines(widget, old, new)
+
+    assert widget.lines == new
+    assert widget.calls == [('insert', '3.0', 'c\n', 'INFO', 'd\n', 'WARNING')]
+
+
+def test_sync_trimmed_and_appended_logs():
+    # The log buffer dropped its oldest line and gained a new one
+    old = [('a', 'INFO'), ('b', 'INFO'), ('c', 'ERROR')]
+    new = [('b', 'INFO'), ('c', 'ERROR'), ('d', 'INFO')]
+    widget = FakeText(old)
+
+    GastosGUI._sync_log_lines(widget, old, new)
+
+    assert widget.lines == new
+    assert widget.calls == [('insert', '4.0', 'd\n', 'INFO'), ('delete', '1.0', '2.0')]
+
+
+def test_sync_same_text_with_new_tag_is_replaced():
+    old = [('a', 'INFO')]
+    new = [('a', 'ERROR')]
+    widget = FakeText(old)
+
+    GastosGUI._sync_log_lines(widget, old, new)
+
+    assert widget.lines == new
+
+
+def test_sync_random_updates_match_new_logs():
+    rng = random.Random(0)
+    widget = FakeText()
+    old = []
+
+    for _ in range(200):
+        new = [(str(rng.randint(0, 20)), rng.choice(('INFO', 'ERROR')))
+               for _ in range(rng.randint(0, 30))]
+        GastosGUI._sync_log_lines(widget, old, new)
+        assert widget.lines == new
+        old = new
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the clipboard helpers in sical_utils.
+
+The Win32 clipboard calls are replaced with fakes that hand out real ctypes
+buffers, so the copied text can be read back on any platform.
+"""
+
+import ctypes
+
+import pytest
+
+pytest.importorskip('robocorp.windows')
+
+import sical_utils
+
+
+class FakeUser32:
+    def __init__(self):
+        self.clipboard = None
+
+    def OpenClipboard(self, owner):
+        return 1
+
+    def EmptyClipboard(self):
+        return 1
+
+    def SetClipboardData(self, fmt, handle):
+        self.clipboard = handle
+        return handle
+
+    def CloseClipboard(self):
+        return 1
+
+
+class FakeKernel32:
+    """GlobalAlloc returns a handle to a real buffer of the requested size."""
+
+    def __init__(self):
+        self.buffers = {}
+
+    def GlobalAlloc(self, flags, size):
+        handle = len(self.buffers) + 1
+        self.buffers[handle] = ctypes.create_string_buffer(size)
+        return handle
+
+    def GlobalLock(self, handle):
+        return ctypes.addressof(self.buffers[handle])
+
+    def GlobalUnlock(self, handle):
+        return 1
+
+    def GlobalFree(self, handle):
+        del self.buffers[handle]
+
+
+@pytest.fixture
+def clipboard(monkeypatch):
+    user32 = FakeUser32()
+    kernel32 = FakeKernel32()
+    monkeypatch.setattr(sical_utils, '_user32', user32, raising=False)
+    monkeypatch.setattr(sical_utils, '_kernel32', kernel32, raising=False)
+
+    def read():
+        return ctypes.wstring_at(ctypes.addressof(kernel32.buffers[user32.clipboard]))
+
+    read.kernel32 = kernel32
+    return read
+
+
+def test_set_clipboard_text(clipboard):
+    sical_utils.set_clipboard_text('Pago {1}')
+
+    assert clipboard() == 'Pago {1}'
+
+
+def test_set_clipboard_text_converts_numbers(clipboard):
+    # num_operacion decoded from JSON may be an int
+    sical_utils.set_clipboard_text(225102376)
+
+    assert clipboard() == '225102376'
+    (buffer,) = clipboard.kernel32.buffers.values()
+    assert ctypes.sizeof(buffer) == ctypes.sizeof(ctypes.c_wchar) * len('225102376\0')
+
+
+def test_paste_text_converts_numbers(clipboard):
+    class Field:
+        def send_keys(self, **kwargs):
+            self.kwargs = kwargs
+
+    field = Field()
+    sical_utils.paste_text(field, 42, wait_time=0)
+
+    assert clipboard() == '42'
+    assert field.kwargs['keys'] == '{Ctrl}{V}'
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for TaskHistoryDB filtering, paging and statistics.
+"""
+
+import pytest
+
+from task_history_db import TaskHistoryDB
+
+
+@pytest.fixture
+def empty_db(tmp_path):
+    return TaskHistoryDB(str(tmp_path / "history.db"))
+
+
+@pytest.fixture
+def mixed_db(empty_db):
+    """Ten tasks: six completed, three failed and one error, added in id order."""
+    statuses = ['completed'] * 6 + ['failed'] * 3 + ['error']
+    for i, status in enumerate(statuses):
+        empty_db.add_task({
+            'task_id': f'task-{i}',
+            'operation_number': f'OP-{i}',
+            'third_party': 'ACME' if i % 2 else 'Other',
+            'status': status,
+            'started_at': f'2024-01-01T10:00:{i:02d}',
+            'duration_seconds': float(i),
+        })
+    return empty_db
+
+
+def test_statistics_empty_db(empty_db):
+    assert empty_db.get_statistics() == {
+        'total_tasks': 0,
+        'completed': 0,
+        'failed': 0,
+        'avg_duration': 0,
+    }
+
+
+def test_statistics_mixed_db(mixed_db):
+    stats = mixed_db.get_statistics()
+
+    assert stats['total_tasks'] == 10
+    assert stats['completed'] == 6
+    # 'error' counts as failed
+    assert stats['failed'] == 4
+    assert stats['avg_duration'] == pytest.approx(4.5)
+
+
+def test_search_tasks_empty_db(empty_db):
+    assert empty_db.search_tasks('task', status_filter='failed') == []
+    assert empty_db.get_all_tasks() == []
+
+
+def test_search_tasks_status_filter(mixed_db):
+    failed = mixed_db.search_tasks('task', status_filter='failed')
+    assert {task['task_id'] for task in failed} == {'task-6', 'task-7', 'task-8'}
+
+    failed_acme = mixed_db.search_tasks('ACME', status_filter='failed')
+    assert {task['task_id'] for task in failed_acme} == {'task-7'}
+
+    assert mixed_db.search_tasks('OP-3', status_filter='completed')[0]['task_id'] == 'task-3'
+    assert mixed_db.search_tasks('OP-3', status_filter='failed') == []
+
+
+def test_search_tasks_without_status_filter(mixed_db):
+    assert len(mixed_db.search_tasks('ACME')) == 5
+    assert mixed_db.search_tasks('missing') == []
+
+
+def test_get_all_tasks_status_filter(mixed_db):
+    assert len(mixed_db.get_all_tasks(status_filter='completed')) == 6
+    assert [task['task_id'] for task in mixed_db.get_all_tasks(status_filter='error')] == ['task-9']
+
+
+def test_get_page_most_recent_first(mixed_db):
+    page = mixed_db.get_page(limit=3)
+    assert [task['task_id'] for task in page] == ['task-9', 'task-8', 'task-7']
+
+
+def test_get_page_offset_covers_all_rows_once(mixed_db):
+    task_ids = []
+    offset = 0
+    while page := mixed_db.get_page(limit=4, offset=offset):
+        task_ids.extend(task['task_id'] for task in page)
+        offset += len(page)
+
+    assert task_ids == [f'task-{i}' for i in reversed(range(10))]
+
+
+def test_get_page_offset_with_filters(mixed_db):
+    first = mixed_db.get_page(limit=2, status_filter='completed', search_term='task')
+    second = mixed_db.get_page(limit=2, offset=2, status_filter='completed', search_term='task')
+
+    assert [task['task_id'] for task in first] == ['task-5', 'task-4']
+    assert [task['task_id'] for task in second] == ['task-3', 'task-2']